@@ -1,22 +1,41 @@
 import base64
+import multiprocessing
 import os
 from datetime import date
 
 from nicegui import ui
 
-from src.generators import generate_ics_string, generate_pdf_bytes
+from src.catalogue import Catalogue
+from src.generators import generate_pdf_bytes
+from src.ics_writer import VEventCache, iter_ics
 from src.scheduler import Scheduler
 from src.scraper import get_course_data
 from src.ui_components import TimetableGrid
 
 # --- Load Data ---
+# Scrape workers must not re-import this module (spawn/forkserver would load
+# the data and start the app again), so parallel extraction needs fork.
+scrape_workers = int(os.environ.get("SCRAPE_WORKERS", 1))
+if "fork" not in multiprocessing.get_all_start_methods():
+    scrape_workers = 1
+
 courses_data = get_course_data(
-    json_path="courses.json", timetable_pdf="timetable.pdf", courses_pdf="courses.pdf"
+    json_path="courses.json",
+    timetable_pdf="timetable.pdf",
+    courses_pdf="courses.pdf",
+    workers=scrape_workers,
+    mp_context="fork",
 )
 
 if not courses_data:
     print("WARNING: No data found. Ensure PDF files are present.")
 
+# Frozen and shared by every page's Scheduler (read-only)
+catalogue = Catalogue(courses_data)
+
+# Serialized VEVENTs per course, shared by every page's ICS download
+ics_cache = VEventCache()
+
 
 @ui.page("/")
 def index():
@@ -25,7 +44,7 @@ def index():
         primary="#3B82F6", secondary="#64748B", positive="#22C55E", negative="#EF4444"
     )
 
-    scheduler = Scheduler(courses_data)
+    scheduler = Scheduler(catalogue)
     course_cards = {}
 
     # Theme state
@@ -71,7 +90,7 @@ def index():
                     return ui.notify("Select courses first!", type="warning")
                 try:
                     b64 = base64.b64encode(
-                        generate_ics_string(flat).encode()).decode()
+                        "".join(iter_ics(flat, recurring=True, cache=ics_cache)).encode()).decode()
                     ui.download(
                         f"data:text/calendar;base64,{b64}", "schedule.ics")
                 except Exception as e:
@@ -117,6 +136,10 @@ def index():
             
             person_input.on_value_change(on_name_change)
 
+            # Outline the slots every name in the group has free
+            free_switch = ui.switch("Group free slots").props("dense")
+            free_switch.on_value_change(lambda: refresh_ui())
+
         separator2 = ui.separator()
 
         # 3. Search Area
@@ -260,77 +283,124 @@ def index():
         # Refresh card styling
         refresh_ui()
 
-    def refresh_ui():
+    # List each card was last placed in: "sel", "conf" or "avail"
+    card_lists = {}
+    # Cards hidden by the search (they stay where they were, ahead of the shown cards)
+    hidden_cards = set()
+    # Card ids sorted by course name, the order of every list
+    card_order = []
+    card_pos = {}
+
+    def refresh_grid():
         # Get flattened schedule for grid
         grid.update(scheduler.get_selected_courses_flat())
+        grid.set_overlay(scheduler.get_common_free_cells() if free_switch.value else [])
+
+    def card_list(cid, conf_ids):
+        if scheduler.is_selected(cid, current_person["name"]):
+            return "sel"
+        if cid in conf_ids:
+            return "conf"
+        return "avail"
+
+    def place_card(cid, list_key, is_dark, index=-1):
+        """Moves a card into its list (at `index`) and styles it for that list."""
+        card = course_cards[cid]
+        if list_key == "sel":
+            card.move(col_sel, target_index=index)
+            if is_dark:
+                card.classes(
+                    "bg-blue-900 border-blue-700 hover:bg-blue-800",
+                    remove="bg-white bg-blue-100 bg-red-100 bg-red-900 bg-gray-800 border-transparent border-blue-500 border-red-300 border-red-800 border-gray-700 opacity-60 opacity-75 hover:bg-gray-100 hover:bg-gray-700 hover:bg-blue-200 cursor-not-allowed",
+                )
+            else:
+                card.classes(
+                    "bg-blue-100 border-blue-500 hover:bg-blue-200",
+                    remove="bg-white bg-red-100 bg-red-900 bg-blue-900 bg-gray-800 border-transparent border-red-300 border-red-800 border-blue-700 border-gray-700 opacity-60 opacity-75 hover:bg-gray-100 hover:bg-gray-700 hover:bg-blue-800 cursor-not-allowed",
+                )
+        elif list_key == "conf":
+            card.move(col_conf, target_index=index)
+            if is_dark:
+                card.classes(
+                    "bg-red-900 border-red-800 opacity-75 cursor-not-allowed",
+                    remove="bg-white bg-blue-100 bg-blue-900 bg-red-100 bg-gray-800 border-transparent border-blue-500 border-blue-700 border-red-300 border-gray-700 hover:bg-gray-100 hover:bg-gray-700 hover:bg-blue-200 hover:bg-blue-800",
+                )
+            else:
+                card.classes(
+                    "bg-red-100 border-red-300 opacity-75 cursor-not-allowed",
+                    remove="bg-white bg-blue-100 bg-blue-900 bg-red-900 bg-gray-800 border-transparent border-blue-500 border-blue-700 border-red-800 border-gray-700 hover:bg-gray-100 hover:bg-gray-700 hover:bg-blue-200 hover:bg-blue-800",
+                )
+        else:
+            card.move(col_avail, target_index=index)
+            if is_dark:
+                card.classes(
+                    "bg-gray-800 border-gray-700 hover:bg-gray-700 hover:shadow",
+                    remove="bg-white bg-blue-100 bg-blue-900 bg-red-100 bg-red-900 border-transparent border-blue-500 border-blue-700 border-red-300 border-red-800 opacity-60 opacity-75 cursor-not-allowed hover:bg-gray-100 hover:bg-blue-200 hover:bg-blue-800",
+                )
+            else:
+                card.classes(
+                    "bg-white border-transparent hover:bg-gray-100 hover:shadow",
+                    remove="bg-blue-100 bg-blue-900 bg-red-100 bg-red-900 bg-gray-800 border-blue-500 border-blue-700 border-red-300 border-red-800 border-gray-700 opacity-60 opacity-75 cursor-not-allowed hover:bg-gray-700 hover:bg-blue-200 hover:bg-blue-800",
+                )
+
+    def update_counts():
+        shown = [key for cid, key in card_lists.items() if cid not in hidden_cards]
+        exp_avail.text = f"Available ({shown.count('avail')})"
+        exp_sel.text = f"Selected ({shown.count('sel')})"
+        exp_conf.text = f"Conflicting ({shown.count('conf')})"
+
+    def refresh_ui():
+        """Full rebuild of the grid and every card (search, person or theme change)."""
+        refresh_grid()
 
-        sel_ids = scheduler.get_selected_ids()
         conf_ids = scheduler.get_conflicting_ids(current_person["name"])
         query = search_field.value.lower() if search_field.value else ""
         is_dark = dark_mode["enabled"]
 
-        count_avail = 0
-        count_sel = 0
-        count_conf = 0
-
-        sorted_ids = sorted(
-            course_cards.keys(), key=lambda k: scheduler.all_courses[k]["name"]
-        )
-
-        for cid in sorted_ids:
+        for cid in card_order:
             card = course_cards[cid]
             course = scheduler.all_courses[cid]
 
-            if query and query not in course["name"].lower():
+            if query and query not in course.name.lower():
                 card.set_visibility(False)
+                hidden_cards.add(cid)
                 continue
             card.set_visibility(True)
+            hidden_cards.discard(cid)
 
-            is_selected_by_person = scheduler.is_selected(cid, current_person["name"])
+            card_lists[cid] = card_list(cid, conf_ids)
+            place_card(cid, card_lists[cid], is_dark)
 
-            if is_selected_by_person:
-                card.move(col_sel)
-                if is_dark:
-                    card.classes(
-                        "bg-blue-900 border-blue-700 hover:bg-blue-800",
-                        remove="bg-white bg-blue-100 bg-red-100 bg-red-900 bg-gray-800 border-transparent border-blue-500 border-red-300 border-red-800 border-gray-700 opacity-60 opacity-75 hover:bg-gray-100 hover:bg-gray-700 hover:bg-blue-200 cursor-not-allowed",
-                    )
-                else:
-                    card.classes(
-                        "bg-blue-100 border-blue-500 hover:bg-blue-200",
-                        remove="bg-white bg-red-100 bg-red-900 bg-blue-900 bg-gray-800 border-transparent border-red-300 border-red-800 border-blue-700 border-gray-700 opacity-60 opacity-75 hover:bg-gray-100 hover:bg-gray-700 hover:bg-blue-800 cursor-not-allowed",
-                    )
-                count_sel += 1
-            elif cid in conf_ids:
-                card.move(col_conf)
-                if is_dark:
-                    card.classes(
-                        "bg-red-900 border-red-800 opacity-75 cursor-not-allowed",
-                        remove="bg-white bg-blue-100 bg-blue-900 bg-red-100 bg-gray-800 border-transparent border-blue-500 border-blue-700 border-red-300 border-gray-700 hover:bg-gray-100 hover:bg-gray-700 hover:bg-blue-200 hover:bg-blue-800",
-                    )
-                else:
-                    card.classes(
-                        "bg-red-100 border-red-300 opacity-75 cursor-not-allowed",
-                        remove="bg-white bg-blue-100 bg-blue-900 bg-red-900 bg-gray-800 border-transparent border-blue-500 border-blue-700 border-red-800 border-gray-700 hover:bg-gray-100 hover:bg-gray-700 hover:bg-blue-200 hover:bg-blue-800",
-                    )
-                count_conf += 1
-            else:
-                card.move(col_avail)
-                if is_dark:
-                    card.classes(
-                        "bg-gray-800 border-gray-700 hover:bg-gray-700 hover:shadow",
-                        remove="bg-white bg-blue-100 bg-blue-900 bg-red-100 bg-red-900 border-transparent border-blue-500 border-blue-700 border-red-300 border-red-800 opacity-60 opacity-75 cursor-not-allowed hover:bg-gray-100 hover:bg-blue-200 hover:bg-blue-800",
-                    )
-                else:
-                    card.classes(
-                        "bg-white border-transparent hover:bg-gray-100 hover:shadow",
-                        remove="bg-blue-100 bg-blue-900 bg-red-100 bg-red-900 bg-gray-800 border-blue-500 border-blue-700 border-red-300 border-red-800 border-gray-700 opacity-60 opacity-75 cursor-not-allowed hover:bg-gray-700 hover:bg-blue-200 hover:bg-blue-800",
-                    )
-                count_avail += 1
+        update_counts()
+
+    def update_cards(delta):
+        """
+        After a toggle, moves only the cards the ConflictDelta names: the
+        toggled course and the courses that became (un)blocked by it.
+        """
+        refresh_grid()
+
+        conf_ids = scheduler.get_conflicting_ids(current_person["name"])
+        is_dark = dark_mode["enabled"]
+        changed = {delta.course_id} | delta.now_conflicting | delta.now_available
 
-        exp_avail.text = f"Available ({count_avail})"
-        exp_sel.text = f"Selected ({count_sel})"
-        exp_conf.text = f"Conflicting ({count_conf})"
+        for cid in changed:
+            if cid in hidden_cards:
+                continue  # placed by the next refresh_ui, when the search shows it
+            list_key = card_list(cid, conf_ids)
+            if list_key == card_lists[cid]:
+                continue
+            card_lists[cid] = list_key
+            # Keep the shown cards in name order: after the hidden ones, then
+            # after every shown card of that list whose name sorts first
+            index = 0
+            for other in card_order:
+                if other != cid and card_lists.get(other) == list_key:
+                    if other in hidden_cards or card_pos[other] < card_pos[cid]:
+                        index += 1
+            place_card(cid, list_key, is_dark, index)
+
+        update_counts()
 
     def on_click(cid):
         person_name = current_person["name"]
@@ -339,62 +409,54 @@ def index():
             return
         
         is_selected = scheduler.is_selected(cid, person_name)
-        is_conflicting = cid in scheduler.get_conflicting_ids(person_name)
+        blocking_ids = [] if is_selected else scheduler.get_blocking_ids(cid, person_name)
         
-        if is_selected or not is_conflicting:
-            scheduler.toggle_course(cid, person_name)
-            refresh_ui()
+        if is_selected or not blocking_ids:
+            update_cards(scheduler.toggle_course(cid, person_name))
         else:
-            ui.notify("Conflict!", type="negative")
+            names = ", ".join(scheduler.all_courses[b].name for b in blocking_ids)
+            ui.notify(f"Conflicts with {names}", type="negative")
 
     # --- Build Cards ---
-    for course in courses_data:
-        cid = course["id"]
+    for course in catalogue:
+        cid = course.id
         with ui.card().classes(
             "w-full p-3 border cursor-pointer transition-all duration-300"
         ) as card:
             card.on("click", lambda e, c=cid: on_click(c))
             with ui.column().classes("gap-1"):
-                course_name = ui.label(course["name"]).classes(
+                course_name = ui.label(course.name).classes(
                     "text-sm font-semibold leading-tight"
                 )
 
-                if course["sessions"]:
+                if course.sessions:
                     with ui.row().classes("gap-2 items-center flex-wrap"):
-                        day_map = {
-                            "Mon": 0,
-                            "Tue": 1,
-                            "Wed": 2,
-                            "Thu": 3,
-                            "Fri": 4,
-                            "Sat": 5,
-                        }
-                        sorted_sess = sorted(
-                            course["sessions"],
-                            key=lambda x: (day_map.get(
-                                x["day"], 9), x["slot"]),
-                        )
-
-                        for s in sorted_sess:
-                            ui.label(f"{s['day']} S{s['slot']}").classes(
+                        # Sessions sort by (day code, slot)
+                        for s in sorted(course.sessions):
+                            ui.label(f"{s.day_name} S{s.slot}").classes(
                                 "text-[10px] bg-gray-600 text-white px-1.5 py-0.5 rounded"
                             )
                 else:
                     ui.label("No slots found").classes(
                         "text-[9px] text-red-500 italic")
 
-                if course["half"] != "BOTH":
+                if course.half != "BOTH":
                     clr = (
                         "bg-green-100 text-green-800"
-                        if "H1" in course["half"]
+                        if "H1" in course.half
                         else "bg-purple-100 text-purple-800"
                     )
-                    ui.label(course["half"]).classes(
+                    ui.label(course.half).classes(
                         f"text-[10px] font-bold px-1.5 py-0.5 rounded {clr}"
                     )
 
         course_cards[cid] = card
 
+    card_order.extend(
+        sorted(course_cards.keys(), key=lambda k: scheduler.all_courses[k].name)
+    )
+    card_pos.update((cid, i) for i, cid in enumerate(card_order))
+
     # Bind Events
     search_field.on_value_change(refresh_ui)
     search_btn.on_click(refresh_ui)  # Manual Trigger
@@ -405,9 +467,10 @@ def index():
 
 
 # --- Run for Deployment ---
-ui.run(
-    title="Timetable Generator",
-    host="0.0.0.0",
-    port=int(os.environ.get("PORT", 8080)),
-    storage_secret="timetable-secret-key",
-)
+if __name__ in {"__main__", "__mp_main__"}:
+    ui.run(
+        title="Timetable Generator",
+        host="0.0.0.0",
+        port=int(os.environ.get("PORT", 8080)),
+        storage_secret="timetable-secret-key",
+    )
@@ -0,0 +1,257 @@
+"""
+Command-line scraper: rebuilds courses.json from the PDFs without starting
+the web app.
+
+    python scrape.py --force --report scrape_report.json
+    python scrape.py --semesters semesters/ --jobs 4
+
+With --semesters, every sub-folder holding its own timetable.pdf/courses.pdf
+(and optionally courses_manual.json) gets its own courses.json; folders whose
+inputs are unchanged are skipped and the rest are scraped in parallel.
+"""
+
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, TextIO
+
+from src.profiling import ScrapeProfiler
+from src.scraper import (
+    CourseScraper,
+    build_scrape_manifest,
+    get_course_data,
+    is_scrape_current,
+)
+
+# File names inside each semester folder
+TIMETABLE_PDF = "timetable.pdf"
+COURSES_PDF = "courses.pdf"
+MANUAL_JSON = "courses_manual.json"
+OUTPUT_JSON = "courses.json"
+
+
+def write_json(data, path: str, stdout: Optional[TextIO] = None):
+    if path == "-":
+        stdout = stdout or sys.stdout
+        json.dump(data, stdout, indent=4)
+        stdout.write("\n")
+        stdout.flush()
+        return
+    with open(path, "w") as f:
+        json.dump(data, f, indent=4)
+    print(f"Wrote {path}")
+
+
+@contextmanager
+def stdout_to_stderr() -> Iterator[TextIO]:
+    """
+    Points file descriptor 1 at stderr, so everything printed by this
+    process and the workers it starts lands there; yields a stream on the
+    original stdout for the JSON output.
+    """
+    sys.stdout.flush()
+    saved = os.dup(1)
+    os.dup2(2, 1)
+    try:
+        with os.fdopen(os.dup(saved), "w") as stdout:
+            yield stdout
+    finally:
+        sys.stdout.flush()
+        os.dup2(saved, 1)
+        os.close(saved)
+
+
+def find_semesters(root: str) -> List[str]:
+    """Sub-folders of `root` that hold a timetable.pdf or courses.pdf."""
+    folders = []
+    for name in sorted(os.listdir(root)):
+        folder = os.path.join(root, name)
+        if any(
+            os.path.isfile(os.path.join(folder, f))
+            for f in (TIMETABLE_PDF, COURSES_PDF)
+        ):
+            folders.append(folder)
+    return folders
+
+
+def scrape_semester(
+    folder: str,
+    force: bool,
+    workers: int,
+    cache_dir: Optional[str],
+    backend: str,
+    report: bool,
+    fuzzy: bool = False,
+) -> Dict:
+    """Builds one semester's courses.json. Runs in a worker process."""
+    profiler = ScrapeProfiler() if report else None
+    courses = get_course_data(
+        json_path=os.path.join(folder, OUTPUT_JSON),
+        manual_path=os.path.join(folder, MANUAL_JSON),
+        timetable_pdf=os.path.join(folder, TIMETABLE_PDF),
+        courses_pdf=os.path.join(folder, COURSES_PDF),
+        force_scrape=force,
+        workers=workers,
+        cache_dir=cache_dir,
+        backend=backend,
+        profiler=profiler,
+        fuzzy=fuzzy,
+    )
+    return {
+        "semester": os.path.basename(folder),
+        "courses": len(courses),
+        "report": profiler.report() if profiler else None,
+    }
+
+
+def run_batch(args, stdout: TextIO) -> int:
+    semesters = find_semesters(args.semesters)
+    if not semesters:
+        print(f"No semester folders with PDFs found in {args.semesters}.")
+        return 1
+
+    pending = []
+    for folder in semesters:
+        manifest = build_scrape_manifest(
+            os.path.join(folder, TIMETABLE_PDF),
+            os.path.join(folder, COURSES_PDF),
+            os.path.join(folder, MANUAL_JSON),
+            args.backend,
+            args.fuzzy,
+        )
+        if not args.force and is_scrape_current(
+            os.path.join(folder, OUTPUT_JSON), manifest
+        ):
+            print(f"{os.path.basename(folder)}: unchanged, skipping.")
+            continue
+        pending.append(folder)
+
+    results = {}
+    if pending:
+        cache_dir = None if args.no_cache else args.cache_dir
+        with ProcessPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+            futures = [
+                pool.submit(
+                    scrape_semester,
+                    folder,
+                    args.force,
+                    args.workers,
+                    cache_dir,
+                    args.backend,
+                    bool(args.report),
+                    args.fuzzy,
+                )
+                for folder in pending
+            ]
+            for future in as_completed(futures):
+                result = future.result()
+                results[result["semester"]] = result
+                print(f"{result['semester']}: {result['courses']} courses.")
+
+    if args.report:
+        write_json(
+            {name: results[name]["report"] for name in sorted(results)},
+            args.report,
+            stdout,
+        )
+    return 0 if all(r["courses"] for r in results.values()) else 1
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Scrape the course catalogue.")
+    parser.add_argument(
+        "--semesters",
+        metavar="DIR",
+        help="Build every semester folder under DIR instead of a single catalogue",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Semesters scraped at once with --semesters",
+    )
+    parser.add_argument("--timetable", default="timetable.pdf")
+    parser.add_argument("--courses", default="courses.pdf")
+    parser.add_argument("--manual", default="courses_manual.json")
+    parser.add_argument("--output", default="courses.json")
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Processes for page extraction"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=CourseScraper.EXTRACTION_BACKENDS,
+        default="table",
+        help="How timetable pages are turned into rows",
+    )
+    parser.add_argument(
+        "--fuzzy",
+        action="store_true",
+        help="Also match misspelt or truncated course names (near misses go in --report)",
+    )
+    parser.add_argument("--cache-dir", default=".scrape_cache")
+    parser.add_argument(
+        "--no-cache", action="store_true", help="Ignore the per-page table cache"
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="Scrape even if no input changed"
+    )
+    parser.add_argument(
+        "--report",
+        metavar="PATH",
+        help="Write a JSON timing report of the scrape ('-' for stdout, logs go to stderr)",
+    )
+    parser.add_argument(
+        "--compare-backends",
+        metavar="PATH",
+        help="Time both extraction backends and write their differences as JSON",
+    )
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    if "-" in (args.report, args.compare_backends):
+        # Keep stdout for the JSON alone
+        with stdout_to_stderr() as stdout:
+            return run(args, stdout)
+    return run(args, sys.stdout)
+
+
+def run(args, stdout: TextIO) -> int:
+    if args.semesters:
+        return run_batch(args, stdout)
+
+    if args.compare_backends:
+        scraper = CourseScraper(
+            timetable_path=args.timetable,
+            courses_path=args.courses,
+            workers=args.workers,
+        )
+        write_json(scraper.compare_backends(), args.compare_backends, stdout)
+        return 0
+
+    profiler = ScrapeProfiler() if args.report else None
+    courses = get_course_data(
+        json_path=args.output,
+        manual_path=args.manual,
+        timetable_pdf=args.timetable,
+        courses_pdf=args.courses,
+        force_scrape=args.force,
+        workers=args.workers,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        backend=args.backend,
+        profiler=profiler,
+        fuzzy=args.fuzzy,
+    )
+    print(f"{len(courses)} courses after merging manual entries.")
+
+    if profiler:
+        write_json(profiler.report(), args.report, stdout)
+    return 0 if courses else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+import hashlib
+import json
+from types import MappingProxyType
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+
+from .models import Course
+from .scoring import TimetableScorer
+from .slot_index import SlotIndex
+from .solver import section_groups
+
+
+class Catalogue:
+    """
+    The course list loaded at startup, converted once from JSON into
+    immutable Course tuples and shared read-only by every page's Scheduler
+    and by the generators. A session holding a reference to a course can
+    never change what another session sees.
+    """
+
+    def __init__(self, courses_data: List[Dict]):
+        courses = [Course.from_json(c) for c in courses_data]
+        # In courses_data order (what the course list shows)
+        self.courses: Tuple[Course, ...] = tuple(courses)
+        # Changes whenever any course does (for export caches)
+        self.version = hashlib.sha1(
+            json.dumps([c.to_json() for c in courses], sort_keys=True).encode()
+        ).hexdigest()[:12]
+        self.by_id: Mapping[str, Course] = MappingProxyType(
+            {c.id: c for c in courses}
+        )
+        # (day, slot, half) -> ids, occupancy masks, conflict matrix
+        self.index = SlotIndex(courses)
+        # "Science II" -> ("Science II A", "Science II B"): interchangeable sections
+        self.sections: Mapping[str, Tuple[str, ...]] = MappingProxyType(
+            section_groups(self.by_id)
+        )
+        # Batch timetable scoring (half x day x slot blocks per course)
+        self.scorer = TimetableScorer(courses)
+
+    def __iter__(self) -> Iterator[Course]:
+        return iter(self.courses)
+
+    def __len__(self) -> int:
+        return len(self.courses)
+
+    def __contains__(self, course_id: str) -> bool:
+        return course_id in self.by_id
+
+    def get(self, course_id: str) -> Optional[Course]:
+        return self.by_id.get(course_id)
@@ -0,0 +1,58 @@
+from typing import Dict, Iterable, List, Mapping, Sequence, Set
+
+import numpy as np
+
+
+class ConflictMatrix:
+    """
+    Dense course-by-course clash matrix for batched (cohort) queries.
+    Row/column i is course ids[i]; clash[i, j] is True when the two courses
+    share a (day, slot, half) bit of their occupancy masks (so H1 vs H2 is
+    not a clash, BOTH clashes with either). The diagonal is False.
+    """
+
+    def __init__(self, course_ids: Sequence[str], masks: Mapping[str, int]):
+        self.ids: List[str] = list(course_ids)
+        self.position: Dict[str, int] = {cid: i for i, cid in enumerate(self.ids)}
+
+        n_bits = max((m.bit_length() for m in masks.values()), default=0)
+        # Course x (cell, half) incidence
+        occupancy = np.zeros((len(self.ids), n_bits), dtype=np.float32)
+        for i, cid in enumerate(self.ids):
+            mask = masks.get(cid, 0)
+            while mask:
+                low = mask & -mask
+                occupancy[i, low.bit_length() - 1] = 1
+                mask ^= low
+
+        clash = (occupancy @ occupancy.T) > 0
+        np.fill_diagonal(clash, False)
+        self.clash = clash
+        self.clash.setflags(write=False)
+        # float32 copy for the BLAS matmul in conflicts_for
+        self._clash_f = clash.astype(np.float32)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def selection_matrix(self, selections: Sequence[Iterable[str]]) -> np.ndarray:
+        """people x courses boolean matrix; unknown ids are ignored."""
+        matrix = np.zeros((len(selections), len(self.ids)), dtype=bool)
+        for row, selected in enumerate(selections):
+            cols = [self.position[cid] for cid in selected if cid in self.position]
+            matrix[row, cols] = True
+        return matrix
+
+    def conflicts_for(self, selection: np.ndarray) -> np.ndarray:
+        """
+        people x courses -> people x courses: True where the course is not
+        selected by that person but clashes with something they selected.
+        """
+        blocked = (selection.astype(np.float32) @ self._clash_f) > 0
+        return blocked & ~selection.astype(bool)
+
+    def conflict_sets(self, selections: Sequence[Iterable[str]]) -> List[Set[str]]:
+        """Each person's conflicting course ids, for a list of selections."""
+        conflicts = self.conflicts_for(self.selection_matrix(selections))
+        ids = np.array(self.ids, dtype=object)
+        return [set(ids[row]) for row in conflicts]
@@ -0,0 +1,156 @@
+import re
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+WHITESPACE_RE = re.compile(r"\s+")
+
+# Stands in for text already claimed by a match. Alignments never run
+# through it, so a term cannot be pieced together from both sides of a
+# claimed span.
+BLANK = "\x00"
+
+
+class FuzzyHit(NamedTuple):
+    term_idx: int
+    distance: int
+    # Span of the cell text the term was aligned to
+    start: int
+    end: int
+
+
+def _grams(text: str, n: int) -> Set[str]:
+    return {text[i : i + n] for i in range(len(text) - n + 1)}
+
+
+def substring_distance(
+    pattern: str, text: str, limit: int
+) -> Optional[Tuple[int, int, int]]:
+    """
+    Fewest edits turning `pattern` into some substring of `text`, as
+    (distance, start, end), or None once it is certain to exceed `limit`.
+    Row minimums never decrease, so the DP stops at the first row whose
+    minimum is already over the limit. BLANK characters in `text` cannot be
+    matched, substituted or skipped.
+    """
+    width = len(text) + 1
+    # Row 0: the alignment may start anywhere in the text at no cost
+    cost = [0] * width
+    start = list(range(width))
+    for i, p_ch in enumerate(pattern, 1):
+        new_cost = [i] + [0] * (width - 1)
+        new_start = [0] * width
+        for j in range(1, width):
+            if text[j - 1] == BLANK:
+                new_cost[j], new_start[j] = limit + 1, j
+                continue
+            best, best_start = cost[j - 1] + (p_ch != text[j - 1]), start[j - 1]
+            if cost[j] + 1 < best:
+                best, best_start = cost[j] + 1, start[j]
+            if new_cost[j - 1] + 1 < best:
+                best, best_start = new_cost[j - 1] + 1, new_start[j - 1]
+            new_cost[j], new_start[j] = best, best_start
+        if min(new_cost) > limit:
+            return None
+        cost, start = new_cost, new_start
+
+    end = min(range(width), key=lambda j: cost[j])
+    if cost[end] > limit:
+        return None
+    return cost[end], start[end], end
+
+
+class FuzzyTermIndex:
+    """
+    Character n-gram inverted index over the registry search terms.
+    `lookup` only touches the posting lists of the grams in the cell, keeps
+    the terms that share enough grams to possibly be within the error budget
+    (q-gram lemma: k edits destroy at most k*n of a term's grams) and runs the
+    bounded edit distance on the best few of those.
+    """
+
+    def __init__(
+        self,
+        terms: Sequence[str],
+        max_error_ratio: float,
+        near_miss_ratio: float,
+        min_length: int,
+        n: int = 3,
+        candidate_limit: int = 5,
+    ):
+        self.n = n
+        self.candidate_limit = candidate_limit
+        self.terms = [WHITESPACE_RE.sub(" ", t.upper()).strip() for t in terms]
+        # Per term: edits still accepted as a match / still reported as a near miss
+        self.max_errors = [int(len(t) * max_error_ratio) for t in self.terms]
+        self.near_errors = [int(len(t) * near_miss_ratio) for t in self.terms]
+
+        self._postings: Dict[str, List[int]] = defaultdict(list)
+        self._gram_counts: List[int] = []
+        for idx, term in enumerate(self.terms):
+            grams = _grams(term, n) if len(term) >= min_length else set()
+            self._gram_counts.append(len(grams))
+            for gram in grams:
+                self._postings[gram].append(idx)
+
+    def lookup(
+        self, text_upper: str, exclude: Set[int] = frozenset()
+    ) -> List[FuzzyHit]:
+        """
+        Best candidates for the cell text, closest first: each within its
+        term's near-miss budget (callers compare against max_errors to tell
+        matches from near misses).
+        """
+        shared: Dict[int, int] = defaultdict(int)
+        for gram in _grams(text_upper, self.n):
+            for idx in self._postings.get(gram, ()):
+                shared[idx] += 1
+
+        candidates = [
+            idx
+            for idx, count in shared.items()
+            if idx not in exclude
+            and count >= self._gram_counts[idx] - self.near_errors[idx] * self.n
+        ]
+        candidates.sort(key=lambda idx: (-shared[idx], idx))
+
+        hits = []
+        for idx in candidates[: self.candidate_limit]:
+            aligned = substring_distance(
+                self.terms[idx], text_upper, self.near_errors[idx]
+            )
+            if aligned is not None:
+                hits.append(FuzzyHit(idx, *aligned))
+        hits.sort(key=lambda hit: (hit.distance, -len(self.terms[hit.term_idx])))
+        return hits
+
+    def match(
+        self, text_upper: str, exclude: Set[int] = frozenset()
+    ) -> Tuple[List[FuzzyHit], List[FuzzyHit]]:
+        """
+        Returns (matches, near_misses), both lists of FuzzyHit.
+        Like the exact matcher, an accepted term blanks the text it was
+        aligned to before the next lookup, so one stretch of text never
+        yields two courses. Text the exact matcher claimed should be passed
+        in already replaced by BLANK; whitespace is collapsed around it but
+        never across it.
+        """
+        text = WHITESPACE_RE.sub(" ", text_upper)
+        exclude = set(exclude)
+        matches: List[FuzzyHit] = []
+        near_misses: List[FuzzyHit] = []
+        while text.strip(" " + BLANK):
+            hits = self.lookup(text, exclude)
+            accepted = next(
+                (h for h in hits if h.distance <= self.max_errors[h.term_idx]), None
+            )
+            if accepted is None:
+                near_misses.extend(hits)
+                break
+            matches.append(accepted)
+            exclude.add(accepted.term_idx)
+            text = (
+                text[: accepted.start]
+                + BLANK * (accepted.end - accepted.start)
+                + text[accepted.end :]
+            )
+        return matches, near_misses
@@ -1,10 +1,13 @@
 import re
-from datetime import date, datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
 from zoneinfo import ZoneInfo
 
 from fpdf import FPDF
 from ics import Calendar, Event
+from ics.grammar.parse import ContentLine
 
+from .models import FlatSession
 from .utils import *
 
 
@@ -20,7 +23,7 @@ class TimetablePDF(FPDF):
         self.cell(0, 10, "Generated via College Timetable Builder", 0, 0, "R")
 
 
-def generate_pdf_bytes(selected_courses: list) -> bytes:
+def generate_pdf_bytes(selected_courses: List[FlatSession]) -> bytes:
     # A4 Landscape: 297mm x 210mm
     pdf = TimetablePDF(orientation="L", unit="mm", format="A4")
     pdf.set_margins(10, 10, 10)
@@ -81,7 +84,7 @@ def generate_pdf_bytes(selected_courses: list) -> bytes:
     pdf.set_xy(MARGIN, MARGIN)
     pdf.set_font("Helvetica", "B", 18)
     pdf.set_text_color(*C_TEXT_MAIN)
-    pdf.cell(EFFECTIVE_W, 8, "Spring 2026 Class Timetable", 0, 1, "C")
+    pdf.cell(EFFECTIVE_W, 8, f"{CALENDAR.name} Class Timetable", 0, 1, "C")
     pdf.set_font("Helvetica", "", 10)
     pdf.set_text_color(100, 100, 100)
     pdf.cell(
@@ -139,6 +142,11 @@ def generate_pdf_bytes(selected_courses: list) -> bytes:
     # --- DRAW GRID ROWS & COURSES ---
     days = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat"]
 
+    # (day code, slot) -> sessions, in selection order
+    by_cell: Dict[Tuple[int, int], List[FlatSession]] = {}
+    for c in selected_courses:
+        by_cell.setdefault((c.day, c.slot), []).append(c)
+
     for d_idx, day in enumerate(days):
         y_curr = y_base + HEADER_H + (d_idx * ROW_H)
 
@@ -162,10 +170,7 @@ def generate_pdf_bytes(selected_courses: list) -> bytes:
             x_idx = slot_num if slot_num < 4 else slot_num + 1
             x_pos = X_OFFSETS[x_idx]
 
-            courses = [
-                c for c in selected_courses if c["day"] == day and c["slot"] == slot_num
-            ]
-            courses = sorted(courses, key=lambda x: x["half"])
+            courses = sorted(by_cell.get((d_idx, slot_num), []), key=lambda x: x.half)
 
             if not courses:
                 continue
@@ -195,7 +200,7 @@ def generate_pdf_bytes(selected_courses: list) -> bytes:
                 c_y = y_curr + margin_gap + (c_idx * (card_height + card_gap))
 
                 # Check for Tag
-                has_tag = course["half"] != "BOTH"
+                has_tag = course.half != "BOTH"
 
                 # Adjust line height slightly if we need space for a tag
                 current_line_height = line_height
@@ -203,9 +208,9 @@ def generate_pdf_bytes(selected_courses: list) -> bytes:
                     current_line_height -= 0.5
 
                 # Colors
-                if course["half"] == "H1":
+                if course.half == "H1":
                     bg_col = C_CARD_H1
-                elif course["half"] == "H2":
+                elif course.half == "H2":
                     bg_col = C_CARD_H2
                 else:
                     bg_col = C_CARD_FULL
@@ -232,13 +237,13 @@ def generate_pdf_bytes(selected_courses: list) -> bytes:
                 pdf.set_text_color(0, 0, 0)
 
                 # Clean Name
-                display_name = course["name"]
+                display_name = course.name
                 display_name = re.sub(
                     r"\s*\(\s*H[12]?\s*\)", "", display_name, flags=re.IGNORECASE
                 ).strip()
 
                 # Classroom
-                classroom = course.get("classroom", "TBD")
+                classroom = course.classroom
                 if classroom and classroom != "TBD":
                     display_text = f"{display_name}\n({classroom})"
                 else:
@@ -262,7 +267,7 @@ def generate_pdf_bytes(selected_courses: list) -> bytes:
                     )  # 1.0 padding from bottom edge
 
                     pdf.set_xy(x_pos + margin_gap, tag_y)
-                    pdf.cell(card_width, tag_h, course["half"], 0, 0, "C")
+                    pdf.cell(card_width, tag_h, course.half, 0, 0, "C")
 
     # Outer Border
     pdf.set_draw_color(*C_GRID_LINE)
@@ -272,63 +277,135 @@ def generate_pdf_bytes(selected_courses: list) -> bytes:
 
 
 # --- ICS GENERATION ---
-def generate_ics_string(selected_courses: list) -> str:
+class EventSpec(NamedTuple):
+    """One VEVENT: a class on `date` in `slot`, optionally recurring weekly."""
+
+    course: FlatSession
+    date: date
+    slot: int
+    until: Optional[date] = None  # repeats weekly (same slot) up to this date
+    exdates: Tuple[date, ...] = ()  # weeks skipped in between
+    rdates: Tuple[Tuple[date, int], ...] = ()  # extra (date, slot) meetings
+
+
+def generate_ics_string(
+    selected_courses: List[FlatSession],
+    recurring: bool = False,
+    calendar: Optional[AcademicCalendar] = None,
+) -> str:
+    """
+    One VEVENT per class occurrence, or with recurring=True one VEVENT per
+    (session, semester half) with a weekly RRULE, EXDATEs for the skipped
+    weeks and RDATEs for make-up days. Both describe the same calendar.
+    Uses the default semester of calendar.json unless one is given.
+    """
     cal = Calendar()
+    for spec in ics_events(selected_courses, recurring, calendar or CALENDAR):
+        _add_event(cal, spec)
+    return cal.serialize()
+
+
+def ics_events(
+    selected_courses: List[FlatSession],
+    recurring: bool,
+    calendar: AcademicCalendar,
+) -> Iterator[EventSpec]:
+    """The VEVENTs of an export, independent of how they are serialized."""
+    if not recurring:
+        for course, day, slot_num in _class_occurrences(selected_courses, calendar):
+            yield EventSpec(course, day.date, slot_num)
+        return
+
+    # (session, semester half) -> [(date, slot held in), ...] in date order
+    series: Dict[Tuple[FlatSession, str], List[Tuple[date, int]]] = {}
+    for course, day, slot_num in _class_occurrences(selected_courses, calendar):
+        series.setdefault((course, day.half), []).append((day.date, slot_num))
+
+    for (course, _half), occurrences in series.items():
+        # The regular weekly meetings, and everything else
+        regular, irregular = [], []
+        for d, slot in occurrences:
+            if d.weekday() == course.day and slot == course.slot:
+                regular.append(d)
+            else:
+                irregular.append((d, slot))
+        if not regular:
+            for d, slot in irregular:
+                yield EventSpec(course, d, slot)
+            continue
+
+        first, last = regular[0], regular[-1]
+        held = set(regular)
+        skipped = tuple(
+            first + timedelta(weeks=w)
+            for w in range((last - first).days // 7 + 1)
+            if first + timedelta(weeks=w) not in held
+        )
+
+        # Make-up days become RDATEs when the class keeps its length,
+        # otherwise (e.g. slot 3 -> the longer slot 6) an event of their own
+        rdates = []
+        for d, slot in irregular:
+            if _slot_minutes(slot) == _slot_minutes(course.slot):
+                rdates.append((d, slot))
+            else:
+                yield EventSpec(course, d, slot)
+
+        yield EventSpec(
+            course,
+            first,
+            course.slot,
+            last if last > first else None,
+            skipped,
+            tuple(rdates),
+        )
+
+
+def _class_occurrences(
+    selected_courses: List[FlatSession], calendar: AcademicCalendar
+) -> Iterator[Tuple[FlatSession, CalendarDay, int]]:
+    """Every (session, calendar day, slot it is held in) of the semester."""
     schedule_map = {}
     for c in selected_courses:
-        key = (c["day"], c["slot"])
+        key = (c.day, c.slot)
         if key not in schedule_map:
             schedule_map[key] = []
         schedule_map[key].append(c)
 
-    current_date = SEM_START
-    while current_date <= SEM_END:
-        if is_blackout(current_date) or current_date in HOLIDAYS:
-            current_date += timedelta(days=1)
-            continue
-        if current_date.weekday() == 6:
-            current_date += timedelta(days=1)
-            continue
-
-        logic_day_str = DAYS_MAP[current_date.weekday()]
-        if current_date == date(2026, 3, 20):
-            logic_day_str = "Sat"
-
-        cancelled_slots = []
-        if current_date == date(2026, 2, 16):
-            cancelled_slots = [1, 2, 3]
-
-        extra_mappings = []
-        if current_date == date(2026, 2, 21):
-            extra_mappings = [(1, 4, "Mon"), (2, 5, "Mon"), (3, 6, "Mon")]
-
+    for day in calendar.teaching_days():
         for slot_num in range(1, 7):
-            if slot_num in cancelled_slots:
+            if slot_num in day.cancelled:
                 continue
-            courses = schedule_map.get((logic_day_str, slot_num), [])
+            courses = schedule_map.get((day.weekday, slot_num), [])
             for course in courses:
-                _add_event_if_valid(cal, course, current_date, slot_num)
+                if _runs_on(course, day):
+                    yield course, day, slot_num
 
-        for src_slot, target_slot, src_day in extra_mappings:
+        for src_day, src_slot, target_slot in day.remaps:
             courses = schedule_map.get((src_day, src_slot), [])
             for course in courses:
-                _add_event_if_valid(cal, course, current_date, target_slot)
-
-        current_date += timedelta(days=1)
-
-    return cal.serialize()
+                if _runs_on(course, day):
+                    yield course, day, target_slot
 
 
-def _add_event_if_valid(cal, course, date_obj, slot_num):
-    c_half = course["half"]
-    current_half = get_semester_half(date_obj)
+def _runs_on(course: FlatSession, day: CalendarDay) -> bool:
+    c_half = course.half
+    current_half = day.half
     if current_half == "NONE":
-        return
+        return False
     if c_half == "H1" and current_half != "H1":
-        return
+        return False
     if c_half == "H2" and current_half != "H2":
-        return
+        return False
+    return True
+
 
+def _slot_minutes(slot_num: int) -> int:
+    start_time, end_time = TIME_SLOTS[slot_num]
+    return (end_time.hour - start_time.hour) * 60 + end_time.minute - start_time.minute
+
+
+def _slot_times(date_obj: date, slot_num: int) -> Tuple[datetime, datetime]:
     start_time, end_time = TIME_SLOTS[slot_num]
 
     # Use Asia/Kolkata (GMT+05:30) explicitly
@@ -337,13 +414,34 @@ def _add_event_if_valid(cal, course, date_obj, slot_num):
     # Combine Date + Time and attach Timezone
     dt_start = datetime.combine(date_obj, start_time).replace(tzinfo=ist_tz)
     dt_end = datetime.combine(date_obj, end_time).replace(tzinfo=ist_tz)
+    return dt_start, dt_end
+
+
+def _utc_stamp(dt: datetime) -> str:
+    # ics writes DTSTART/DTEND in UTC, so the recurrence dates match it
+    return dt.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def _add_event(cal, spec: EventSpec):
+    course = spec.course
+    dt_start, dt_end = _slot_times(spec.date, spec.slot)
 
     e = Event()
-    e.name = course["name"]
+    e.name = course.name
     e.begin = dt_start
     e.end = dt_end
     # Add classroom as location
-    classroom = course.get("classroom", "TBD")
+    classroom = course.classroom
     if classroom:
         e.location = classroom
+
+    if spec.until:
+        until = _utc_stamp(_slot_times(spec.until, spec.slot)[0])
+        e.extra.append(ContentLine(name="RRULE", value=f"FREQ=WEEKLY;UNTIL={until}"))
+    if spec.exdates:
+        value = ",".join(_utc_stamp(_slot_times(d, spec.slot)[0]) for d in spec.exdates)
+        e.extra.append(ContentLine(name="EXDATE", value=value))
+    if spec.rdates:
+        value = ",".join(_utc_stamp(_slot_times(d, slot)[0]) for d, slot in spec.rdates)
+        e.extra.append(ContentLine(name="RDATE", value=value))
     cal.events.add(e)
@@ -0,0 +1,156 @@
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .occupancy import HALF_BITS
+from .slot_index import Cell, SlotIndex
+from .utils import TIME_SLOTS
+
+# The grid everyone can be free in: Mon-Sat x slots x halves
+GRID_DAYS = range(6)
+GRID_SLOTS = sorted(TIME_SLOTS)
+
+
+def cell_bit(day: int, slot: int, half: str) -> int:
+    """Fixed bit of a (day, slot, half) cell, independent of the catalogue."""
+    return (day * len(GRID_SLOTS) + GRID_SLOTS.index(slot)) * 2 + (HALF_BITS[half] >> 1)
+
+
+ALL_CELLS: List[Cell] = [
+    (day, slot, half) for day in GRID_DAYS for slot in GRID_SLOTS for half in HALF_BITS
+]
+FULL_GRID = sum(1 << cell_bit(*cell) for cell in ALL_CELLS)
+
+
+class GroupAnalytics:
+    """
+    Who in a friend group is busy when, kept up to date one toggle at a
+    time: a busy bitset per person over the fixed grid, a count of busy
+    people per cell (so the common free cells are one mask), and pairwise
+    shared-course and overlapping-busy-cell counts. A toggle only touches
+    the toggling person's row, so it costs O(group size).
+    """
+
+    def __init__(self, index: SlotIndex):
+        self._index = index
+        self._course_bits: Dict[str, int] = {}
+        self._courses: Dict[str, Set[str]] = {}
+        self.busy: Dict[str, int] = {}
+        # cell bit -> number of people busy in it
+        self._busy_people: Dict[int, int] = {}
+        self._any_busy = 0
+        # person -> other person -> count (symmetric, zero entries dropped)
+        self.shared: Dict[str, Dict[str, int]] = {}
+        self.overlap: Dict[str, Dict[str, int]] = {}
+
+    def _bits_of(self, course_id: str) -> int:
+        if course_id not in self._course_bits:
+            self._course_bits[course_id] = sum(
+                1 << cell_bit(*cell)
+                for cell in self._index.cells_of(course_id)
+                if cell[0] in GRID_DAYS and cell[1] in TIME_SLOTS
+            )
+        return self._course_bits[course_id]
+
+    def course_toggled(
+        self, person: str, course_id: str, selected: bool, classmates: Iterable[str]
+    ):
+        """
+        Applies one toggle_course change. `classmates` are the other people
+        who have course_id selected.
+        """
+        courses = self._courses.setdefault(person, set())
+        if selected:
+            courses.add(course_id)
+        else:
+            courses.discard(course_id)
+
+        step = 1 if selected else -1
+        for other in classmates:
+            if other != person:
+                self._bump(self.shared, person, other, step)
+
+        busy = 0
+        for cid in courses:
+            busy |= self._bits_of(cid)
+        self._set_busy(person, busy)
+
+        if not courses:
+            del self._courses[person]
+            self.busy.pop(person, None)
+
+    def _set_busy(self, person: str, busy: int):
+        old = self.busy.get(person, 0)
+        self.busy[person] = busy
+        if busy == old:
+            return
+
+        changed = old ^ busy
+        while changed:
+            low = changed & -changed
+            bit = low.bit_length() - 1
+            count = self._busy_people.get(bit, 0) + (1 if busy & low else -1)
+            if count:
+                self._busy_people[bit] = count
+                self._any_busy |= low
+            else:
+                del self._busy_people[bit]
+                self._any_busy &= ~low
+            changed ^= low
+
+        for other, other_busy in self.busy.items():
+            if other == person:
+                continue
+            before = (old & other_busy).bit_count()
+            after = (busy & other_busy).bit_count()
+            if after != before:
+                self._bump(self.overlap, person, other, after - before)
+
+    @staticmethod
+    def _bump(table: Dict[str, Dict[str, int]], a: str, b: str, step: int):
+        for x, y in ((a, b), (b, a)):
+            row = table.setdefault(x, {})
+            row[y] = row.get(y, 0) + step
+            if not row[y]:
+                del row[y]
+                if not row:
+                    del table[x]
+
+    # --- Queries ---
+
+    def people(self) -> List[str]:
+        return sorted(self._courses)
+
+    def common_free(self, people: Optional[Iterable[str]] = None) -> List[Cell]:
+        """Grid cells where none of `people` (default: everyone) has a class."""
+        if people is None:
+            busy = self._any_busy
+        else:
+            busy = 0
+            for person in people:
+                busy |= self.busy.get(person, 0)
+        free = FULL_GRID & ~busy
+        return [cell for cell in ALL_CELLS if free >> cell_bit(*cell) & 1]
+
+    def matrices(
+        self, people: Optional[List[str]] = None
+    ) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """
+        (names, shared, overlap): people x people counts of shared courses
+        and of busy (day, slot, half) cells in common. The diagonal holds
+        each person's own course / busy-cell count.
+        """
+        names = self.people() if people is None else list(people)
+        n = len(names)
+        shared = np.zeros((n, n), dtype=np.int32)
+        overlap = np.zeros((n, n), dtype=np.int32)
+        for i, a in enumerate(names):
+            shared[i, i] = len(self._courses.get(a, ()))
+            overlap[i, i] = self.busy.get(a, 0).bit_count()
+            shared_row = self.shared.get(a, {})
+            overlap_row = self.overlap.get(a, {})
+            for j, b in enumerate(names):
+                if i != j:
+                    shared[i, j] = shared_row.get(b, 0)
+                    overlap[i, j] = overlap_row.get(b, 0)
+        return names, shared, overlap
@@ -0,0 +1,239 @@
+import hashlib
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from .generators import EventSpec, generate_ics_string, ics_events
+from .models import FlatSession
+from .utils import CALENDAR, TIME_SLOTS, AcademicCalendar
+
+# --- RFC 5545 constants ---
+CRLF = "\r\n"
+TZID = "Asia/Kolkata"
+PRODID = "-//timetable_generator//ICS export//EN"
+UID_DOMAIN = "timetable-generator"
+
+# India has no DST, so one STANDARD rule covers every date
+IST = timezone(timedelta(hours=5, minutes=30))
+VTIMEZONE = [
+    "BEGIN:VTIMEZONE",
+    f"TZID:{TZID}",
+    "BEGIN:STANDARD",
+    "DTSTART:19700101T000000",
+    "TZOFFSETFROM:+0530",
+    "TZOFFSETTO:+0530",
+    "TZNAME:IST",
+    "END:STANDARD",
+    "END:VTIMEZONE",
+]
+
+# slot -> ("T083000", "T095500"): local times appended to a YYYYMMDD date
+SLOT_TEMPLATES: Dict[int, Tuple[str, str]] = {
+    slot: (start.strftime("T%H%M%S"), end.strftime("T%H%M%S"))
+    for slot, (start, end) in TIME_SLOTS.items()
+}
+
+
+def escape_text(value: str) -> str:
+    """TEXT value escaping (RFC 5545 3.3.11)."""
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold(line: str) -> str:
+    """Folds a content line at 75 octets without splitting a UTF-8 character."""
+    if len(line) <= 75 and line.isascii():
+        return line
+    parts: List[str] = []
+    current: List[str] = []
+    size = 0
+    limit = 75
+    for char in line:
+        width = len(char.encode("utf-8"))
+        if size + width > limit:
+            parts.append("".join(current))
+            current, size, limit = [], 0, 74  # continuation lines start with a space
+        current.append(char)
+        size += width
+    parts.append("".join(current))
+    return (CRLF + " ").join(parts)
+
+
+def event_uid(spec: EventSpec) -> str:
+    """Same course, name, date and slot -> same UID in every export."""
+    course = spec.course
+    key = (
+        f"{course.course_id}|{course.name}|{course.half}|{spec.date:%Y%m%d}|{spec.slot}"
+    )
+    return f"{hashlib.sha1(key.encode()).hexdigest()[:20]}@{UID_DOMAIN}"
+
+
+def _local(d: date, slot: int, end: bool = False) -> str:
+    return f"{d:%Y%m%d}{SLOT_TEMPLATES[slot][1 if end else 0]}"
+
+
+def _utc_until(d: date, slot: int) -> str:
+    start = datetime.combine(d, TIME_SLOTS[slot][0]).replace(tzinfo=IST)
+    return start.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def vevent(spec: EventSpec, stamp: str) -> str:
+    """One serialized VEVENT (CRLF-terminated lines)."""
+    course = spec.course
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{event_uid(spec)}",
+        f"DTSTAMP:{stamp}",
+        f"DTSTART;TZID={TZID}:{_local(spec.date, spec.slot)}",
+        f"DTEND;TZID={TZID}:{_local(spec.date, spec.slot, end=True)}",
+        fold(f"SUMMARY:{escape_text(course.name)}"),
+    ]
+    if course.classroom:
+        lines.append(fold(f"LOCATION:{escape_text(course.classroom)}"))
+    if spec.until:
+        lines.append(f"RRULE:FREQ=WEEKLY;UNTIL={_utc_until(spec.until, spec.slot)}")
+    if spec.exdates:
+        value = ",".join(_local(d, spec.slot) for d in spec.exdates)
+        lines.append(fold(f"EXDATE;TZID={TZID}:{value}"))
+    if spec.rdates:
+        value = ",".join(_local(d, slot) for d, slot in spec.rdates)
+        lines.append(fold(f"RDATE;TZID={TZID}:{value}"))
+    lines.append("END:VEVENT")
+    return CRLF.join(lines) + CRLF
+
+
+class VEventCache:
+    """
+    Bounded LRU of serialized VEVENT blocks, one entry per selected course
+    as displayed, keyed by its FlatSessions, the mode and the calendar
+    version. Everyone who picks a popular course shares its entry, so an
+    export is mostly string concatenation. The key holds everything a
+    block is built from, so a reloaded catalogue or calendar simply yields
+    new keys and the old entries age out.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._fragments: "OrderedDict[tuple, str]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        self._fragments.clear()
+
+    def fragment(self, key: tuple, build: Callable[[], str]) -> str:
+        if key in self._fragments:
+            self.hits += 1
+            self._fragments.move_to_end(key)
+            return self._fragments[key]
+        self.misses += 1
+        text = build()
+        self._fragments[key] = text
+        if len(self._fragments) > self.max_entries:
+            self._fragments.popitem(last=False)
+        return text
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._fragments)}
+
+
+def iter_ics(
+    selected_courses: List[FlatSession],
+    recurring: bool = False,
+    calendar: Optional[AcademicCalendar] = None,
+    stamp: Optional[str] = None,
+    cache: Optional[VEventCache] = None,
+) -> Iterator[str]:
+    """
+    The calendar as text chunks (header, one per course, footer), written
+    straight from the slot templates instead of ics.Event objects. With a
+    cache, each course's VEVENTs are serialized once and then reused
+    (keeping the DTSTAMP of when they were first built).
+    """
+    calendar = calendar or CALENDAR
+    if stamp is None:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    yield CRLF.join(
+        ["BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODID}", *VTIMEZONE]
+    ) + CRLF
+
+    # A course's events depend only on its own sessions and the calendar
+    courses: Dict[Tuple[str, str, str], List[FlatSession]] = {}
+    for session in selected_courses:
+        key = (session.course_id, session.name, session.half)
+        courses.setdefault(key, []).append(session)
+
+    for sessions in courses.values():
+        build = lambda: "".join(
+            vevent(spec, stamp) for spec in ics_events(sessions, recurring, calendar)
+        )
+        if cache is None:
+            yield build()
+        else:
+            yield cache.fragment((tuple(sessions), recurring, calendar.version), build)
+    yield "END:VCALENDAR" + CRLF
+
+
+def write_ics(
+    selected_courses: List[FlatSession],
+    sink: TextIO,
+    recurring: bool = False,
+    calendar: Optional[AcademicCalendar] = None,
+    cache: Optional[VEventCache] = None,
+) -> int:
+    """Streams the calendar into a file-like object; returns characters written."""
+    written = 0
+    for chunk in iter_ics(selected_courses, recurring, calendar, cache=cache):
+        sink.write(chunk)
+        written += len(chunk)
+    return written
+
+
+def benchmark(selected_courses: List[FlatSession], repeat: int = 5) -> Dict[str, float]:
+    """Best-of-`repeat` seconds of the ics-library path and this serializer (uncached and cached)."""
+    timings = {}
+    cache = VEventCache()
+    for recurring in (False, True):
+        mode = "recurring" if recurring else "expanded"
+        runs = {
+            f"ics_library_{mode}": lambda: generate_ics_string(
+                selected_courses, recurring
+            ),
+            f"stream_{mode}": lambda: "".join(iter_ics(selected_courses, recurring)),
+            f"stream_cached_{mode}": lambda: "".join(
+                iter_ics(selected_courses, recurring, cache=cache)
+            ),
+        }
+        for name, run in runs.items():
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                run()
+                best = min(best, time.perf_counter() - start)
+            timings[name] = best
+    return timings
+
+
+if __name__ == "__main__":
+    # python -m src.ics_writer: time both serializers on a sample selection
+    import random
+
+    from .catalogue import Catalogue
+    from .scheduler import Scheduler
+    from .scraper import load_courses_from_json
+
+    scheduler = Scheduler(Catalogue(load_courses_from_json("courses.json")))
+    random.seed(0)
+    ids = list(scheduler.all_courses)
+    for person in ("Alice", "Bob", ""):
+        for cid in random.sample(ids, min(12, len(ids))):
+            scheduler.toggle_course(cid, person)
+    flat = scheduler.get_selected_courses_flat()
+    for name, seconds in benchmark(flat).items():
+        print(f"{name:<24} {seconds * 1000:8.1f} ms")
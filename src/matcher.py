@@ -0,0 +1,102 @@
+from collections import deque
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+class TermMatcher:
+    """
+    Aho-Corasick automaton over the registry search terms and their aliases.
+    Compiled once per scrape; `match` scans a cell in a single pass and then
+    replays the scraper's longest-term-first, blank-out-after-match rules on
+    the (few) terms that actually occur in it.
+    """
+
+    def __init__(
+        self,
+        search_terms: List[str],
+        alias_map: Dict[str, List[str]],
+        two_slot_names: Iterable[str],
+    ):
+        # search_terms must already be in priority order (longest first)
+        self.terms = list(search_terms)
+        self.term_ids = {term: idx for idx, term in enumerate(self.terms)}
+        two_slot_names = list(two_slot_names)
+
+        # Per term: patterns in the order they are tried (term first, then aliases)
+        self._patterns: List[Tuple[str, ...]] = []
+        self._two_slot: List[bool] = []
+        for term in self.terms:
+            term_upper = term.upper()
+            aliases = alias_map.get(term_upper, [])
+            self._patterns.append((term_upper, *aliases))
+            self._two_slot.append(
+                any(ts in term_upper for ts in two_slot_names)
+                or any(ts in alias for alias in aliases for ts in two_slot_names)
+            )
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Set[int]] = [set()]
+        self._build()
+
+    def _build(self):
+        for term_idx, patterns in enumerate(self._patterns):
+            for pattern in patterns:
+                state = 0
+                for ch in pattern:
+                    nxt = self._goto[state].get(ch)
+                    if nxt is None:
+                        nxt = len(self._goto)
+                        self._goto.append({})
+                        self._fail.append(0)
+                        self._out.append(set())
+                        self._goto[state][ch] = nxt
+                    state = nxt
+                self._out[state].add(term_idx)
+
+        # Breadth-first fail links; outputs inherit those of their fail state
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt] |= self._out[self._fail[nxt]]
+
+        self._out = [frozenset(out) for out in self._out]
+
+    def candidates(self, text_upper: str) -> List[int]:
+        """Indices (in priority order) of terms with any pattern occurring in the text."""
+        goto, fail, out = self._goto, self._fail, self._out
+        found: Set[int] = set()
+        state = 0
+        for ch in text_upper:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                found.update(out[state])
+        return sorted(found)
+
+    def is_two_slot(self, term_idx: int) -> bool:
+        return self._two_slot[term_idx]
+
+    def match(self, text_upper: str) -> List[Tuple[str, str, bool]]:
+        """
+        Returns [(term, matched_text, is_two_slot), ...] in the order the terms
+        claim the cell. Each match blanks every occurrence of its text before
+        the next (shorter) term is tried, so overlapping matches are dropped.
+        """
+        matches = []
+        remaining = text_upper
+        for term_idx in self.candidates(text_upper):
+            for pattern in self._patterns[term_idx]:
+                if pattern in remaining:
+                    matches.append(
+                        (self.terms[term_idx], pattern, self._two_slot[term_idx])
+                    )
+                    remaining = remaining.replace(pattern, " " * len(pattern))
+                    break
+        return matches
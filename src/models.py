@@ -0,0 +1,85 @@
+import sys
+from typing import Dict, NamedTuple, Tuple
+
+from .utils import DAYS_MAP, TIME_SLOTS
+
+# "Mon" -> 0 ... "Sun" -> 6 (inverse of utils.DAYS_MAP)
+DAY_CODES = {name: code for code, name in DAYS_MAP.items()}
+
+
+class Session(NamedTuple):
+    day: int  # DAYS_MAP code, 0 = Mon
+    slot: int  # 1-6, see utils.TIME_SLOTS
+
+    @property
+    def day_name(self) -> str:
+        return DAYS_MAP[self.day]
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "Session":
+        slot = int(data["slot"])
+        if slot not in TIME_SLOTS:
+            raise ValueError(f"slot {slot} is not in TIME_SLOTS")
+        return cls(DAY_CODES[data["day"]], slot)
+
+    def to_json(self) -> Dict:
+        return {"day": self.day_name, "slot": self.slot}
+
+
+class Course(NamedTuple):
+    id: str
+    name: str
+    half: str  # "H1", "H2" or "BOTH"
+    classroom: str
+    sessions: Tuple[Session, ...]
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "Course":
+        """Sessions with an unknown day or slot are skipped (and reported)."""
+        sessions = []
+        for s in data.get("sessions", []):
+            try:
+                sessions.append(Session.from_json(s))
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"Skipping bad session {s!r} of {data['id']}: {e!r}")
+        return cls(
+            data["id"],
+            data["name"],
+            sys.intern(data.get("half") or "BOTH"),
+            data.get("classroom", "TBD"),
+            tuple(sessions),
+        )
+
+    def to_json(self) -> Dict:
+        return {
+            "id": self.id,
+            "name": self.name,
+            "half": self.half,
+            "classroom": self.classroom,
+            "sessions": [s.to_json() for s in self.sessions],
+        }
+
+
+class FlatSession(NamedTuple):
+    """One selected session as drawn by the grid, the PDF and the ICS export."""
+    name: str  # display name, e.g. "Course (Alice/Bob)"
+    half: str
+    day: int
+    slot: int
+    course_id: str
+    classroom: str
+
+    @property
+    def day_name(self) -> str:
+        return DAYS_MAP[self.day]
+
+    def to_json(self) -> Dict:
+        return {
+            "name": self.name,
+            "half": self.half,
+            "day": self.day_name,
+            "slot": self.slot,
+            "course_id": self.course_id,
+            "classroom": self.classroom,
+        }
+
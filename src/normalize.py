@@ -0,0 +1,98 @@
+import re
+from functools import lru_cache
+from typing import Dict
+
+# --- Compiled once for every scraper ---
+WHITESPACE_RE = re.compile(r"\s+")
+INTRO_RE = re.compile(r"\bIntro[\.:]?\b", re.IGNORECASE)
+AND_RE = re.compile(r"\bAnd\b", re.IGNORECASE)
+ROMAN_DASH_RE = re.compile(r"\s*-\s*(I|II)\b")
+ROMAN_END_RE = re.compile(r"\s+(I|II)$")
+
+HALF_BOTH_MARKERS = ("H1+H2", "H1/H2", "H1&H2", "(H1,H2)", "H1 AND H2")
+H1_RE = re.compile(r"\(H1\)| H1 |^H1 | H1$")
+H2_RE = re.compile(r"\(H2\)| H2 |^H2 | H2$")
+
+PARENS_RE = re.compile(r"\(([^)]*)\)")
+HALF_TAG_RE = re.compile(r"^H[12]?(\s*(AND|[+&/])\s*H[12]?)?$")
+
+
+class NameNormalizer:
+    """
+    The scraper's text rules (clean-up, half tags, official names) with every
+    pattern precompiled and each function memoised on its raw input. Cell
+    text repeats heavily across pages and across _merge_broken_rows, so most
+    calls are cache hits; cache_stats() reports how many.
+    """
+
+    def __init__(self, name_corrections: Dict[str, str], cache_size: int = 8192):
+        self.name_corrections = dict(name_corrections)
+        self.clean_text = lru_cache(maxsize=cache_size)(self._clean_text)
+        self.parse_half_from_string = lru_cache(maxsize=cache_size)(
+            self._parse_half_from_string
+        )
+        self.get_official_name = lru_cache(maxsize=cache_size)(self._get_official_name)
+
+    def _clean_text(self, text: str) -> str:
+        if not text:
+            return ""
+
+        text = text.replace("\n", " ").replace("\r", " ")
+        text = WHITESPACE_RE.sub(" ", text)
+
+        text = INTRO_RE.sub("Introduction", text)
+        text = text.replace("&", " and ")
+        text = AND_RE.sub("and", text)
+
+        # Normalize Roman Numerals (Space + I/II)
+        text = ROMAN_DASH_RE.sub(r" \1", text)
+        text = ROMAN_END_RE.sub(r" \1", text)
+
+        return WHITESPACE_RE.sub(" ", text).strip()
+
+    def _parse_half_from_string(self, text: str) -> str:
+        upper = text.upper()
+        if any(x in upper for x in HALF_BOTH_MARKERS):
+            return "BOTH"
+
+        has_h1 = bool(H1_RE.search(upper)) or ("(H1)" in upper)
+        has_h2 = bool(H2_RE.search(upper)) or ("(H2)" in upper)
+
+        if has_h1 and not has_h2:
+            return "H1"
+        if has_h2 and not has_h1:
+            return "H2"
+        return "BOTH"
+
+    @staticmethod
+    def _strip_tag(match: re.Match) -> str:
+        """Drops "(H1)", "(Max 40)", "(3)"-style parentheses; keeps the rest."""
+        content = match.group(1).strip()
+        content_upper = content.upper()
+
+        if HALF_TAG_RE.match(content_upper):
+            return ""
+        if content_upper.startswith("MAX") or content_upper.startswith("LIMIT"):
+            return ""
+        if content.isdigit():
+            return ""
+        return match.group(0)
+
+    def _get_official_name(self, raw_name: str) -> str:
+        raw_name = self.name_corrections.get(raw_name, raw_name)
+
+        cleaned = PARENS_RE.sub(self._strip_tag, raw_name)
+        cleaned = cleaned.replace("  ", " ").strip()
+        return cleaned.rstrip(".,").strip()
+
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Hit/miss/size counters of each memoised rule."""
+        stats = {}
+        for name in ("clean_text", "parse_half_from_string", "get_official_name"):
+            info = getattr(self, name).cache_info()
+            stats[name] = {
+                "hits": info.hits,
+                "misses": info.misses,
+                "size": info.currsize,
+            }
+        return stats
@@ -0,0 +1,48 @@
+from typing import Dict, Iterable, Tuple
+
+from .models import Course, Session
+
+# Each (day, slot) cell owns two adjacent bits: H1 and H2.
+# Any other half ("BOTH", or a missing/unknown one) occupies both, which is
+# exactly the rule of Scheduler._check_session_conflict: only H1 vs H2 is
+# not a clash.
+HALF_BITS = {"H1": 0b01, "H2": 0b10}
+BOTH_HALVES = 0b11
+
+
+def half_bits(half: str) -> int:
+    return HALF_BITS.get(half, BOTH_HALVES)
+
+
+class OccupancyMasks:
+    """
+    Every course's timetable as one integer: bit 2*i (H1) and 2*i+1 (H2) of
+    the i-th (day, slot) cell it meets in. Two courses clash iff their masks
+    share a bit, and a person's occupancy is the OR of their courses.
+    """
+
+    def __init__(self, courses: Iterable[Course]):
+        # (day, slot) -> cell number, assigned in order of first appearance
+        self.cells: Dict[Tuple[int, int], int] = {}
+        self.masks: Dict[str, int] = {}
+        for course in courses:
+            self.masks[course.id] = self.mask_of(course.sessions, course.half)
+
+    def _cell(self, day: int, slot: int) -> int:
+        key = (day, slot)
+        if key not in self.cells:
+            self.cells[key] = len(self.cells)
+        return self.cells[key]
+
+    def mask_of(self, sessions: Iterable[Session], half: str) -> int:
+        bits = half_bits(half)
+        mask = 0
+        for sess in sessions:
+            mask |= bits << (2 * self._cell(sess.day, sess.slot))
+        return mask
+
+    def union(self, course_ids: Iterable[str]) -> int:
+        mask = 0
+        for cid in course_ids:
+            mask |= self.masks.get(cid, 0)
+        return mask
@@ -0,0 +1,112 @@
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import Any, Dict, List, Optional, Tuple
+
+# (pdf file name, page index)
+PageKey = Tuple[str, int]
+
+
+class ScrapeProfiler:
+    """
+    Wall-clock accounting for one scrape, by stage and by page.
+    Stage times are exclusive: time spent in a nested stage (e.g. normalize
+    inside merge_rows) is counted once, under the inner stage, so the stage
+    totals add up to the time actually spent.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.stages: Dict[str, float] = defaultdict(float)
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.counters: Dict[str, int] = defaultdict(int)
+        self.pages: Dict[PageKey, Dict[str, Any]] = {}
+        self.extra: Dict[str, Any] = {}
+        # Open stages: [name, page, start, seconds spent in nested stages]
+        self._stack: List[List[Any]] = []
+
+    def _page(self, page: PageKey) -> Dict[str, Any]:
+        if page not in self.pages:
+            self.pages[page] = {
+                "stages": defaultdict(float),
+                "counts": defaultdict(int),
+            }
+        return self.pages[page]
+
+    def _current_page(self) -> Optional[PageKey]:
+        return self._stack[-1][1] if self._stack else None
+
+    @contextmanager
+    def stage(self, name: str, page: Optional[PageKey] = None):
+        """Times a block; nested stages inherit the enclosing stage's page."""
+        frame = [name, page or self._current_page(), time.perf_counter(), 0.0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            elapsed = time.perf_counter() - frame[2]
+            self.add(name, elapsed - frame[3], frame[1])
+            if self._stack:
+                self._stack[-1][3] += elapsed
+
+    def add(self, name: str, seconds: float, page: Optional[PageKey] = None):
+        self.stages[name] += seconds
+        self.calls[name] += 1
+        if page is not None:
+            self._page(page)["stages"][name] += seconds
+
+    def count(self, name: str, n: int = 1, page: Optional[PageKey] = None):
+        self.counters[name] += n
+        page = page or self._current_page()
+        if page is not None:
+            self._page(page)["counts"][name] += n
+
+    def merge(self, other: "ScrapeProfiler"):
+        """Folds in a profiler filled by a worker process."""
+        for name, seconds in other.stages.items():
+            self.stages[name] += seconds
+        for name, n in other.calls.items():
+            self.calls[name] += n
+        for name, n in other.counters.items():
+            self.counters[name] += n
+        for page, record in other.pages.items():
+            mine = self._page(page)
+            for name, seconds in record["stages"].items():
+                mine["stages"][name] += seconds
+            for name, n in record["counts"].items():
+                mine["counts"][name] += n
+
+    def report(self) -> Dict[str, Any]:
+        """JSON-serialisable summary of everything recorded so far."""
+        pages = []
+        for (source, idx), record in sorted(self.pages.items()):
+            stages = {k: round(v, 6) for k, v in record["stages"].items()}
+            pages.append(
+                {
+                    "source": source,
+                    "page": idx,
+                    "seconds": round(sum(record["stages"].values()), 6),
+                    "stages": stages,
+                    "counts": dict(record["counts"]),
+                }
+            )
+        return {
+            "wall_seconds": round(time.perf_counter() - self.started, 6),
+            "stages": {
+                name: {"seconds": round(seconds, 6), "calls": self.calls[name]}
+                for name, seconds in self.stages.items()
+            },
+            "counts": dict(self.counters),
+            "pages": pages,
+            **self.extra,
+        }
+
+
+def profile_stage(
+    profiler: Optional[ScrapeProfiler], name: str, page: Optional[PageKey] = None
+):
+    """profiler.stage(...) or a no-op when profiling is off."""
+    if profiler is None:
+        return nullcontext()
+    return profiler.stage(name, page)
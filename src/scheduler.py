@@ -1,15 +1,48 @@
-from typing import Dict, List, Set, Tuple
+from typing import Dict, FrozenSet, List, Mapping, NamedTuple, Optional, Set, Tuple, Union
+
+from .catalogue import Catalogue
+from .group import GroupAnalytics
+from .models import Course, FlatSession, Session
+from .scoring import RankedTimetable, ScoreWeights, preview_sessions
+from .solver import SolverResult, build_wishes, solve
+
+
+class ConflictDelta(NamedTuple):
+    """What one toggle_course call changed for that person."""
+    course_id: str
+    person_name: str
+    selected: bool  # course_id is selected after the toggle
+    now_conflicting: FrozenSet[str]  # were available, now conflicting
+    now_available: FrozenSet[str]  # were conflicting, now available
 
 
 class Scheduler:
-    def __init__(self, courses_data: List[Dict]):
-        # courses_data is now a list of UNIQUE course objects
+    def __init__(self, catalogue: Union[Catalogue, List[Dict]]):
+        # A shared Catalogue (or a list of UNIQUE course JSON objects to build one from)
         # [ {id, name, half, sessions: []}, ... ]
-        self.all_courses = {c["id"]: c for c in courses_data} 
-        # Structure: {course_id: {person_name: {half: ..., sessions: ...}}}
-        self.selected_courses: Dict[str, Dict[str, Dict]] = {}
+        if not isinstance(catalogue, Catalogue):
+            catalogue = Catalogue(catalogue)
+        self.catalogue = catalogue
+        # Read-only, shared with every other session
+        self.all_courses: Mapping[str, Course] = catalogue.by_id
+        self.index = catalogue.index
+        # Only this session's own state is mutable; it holds references to
+        # the immutable catalogue Courses, never copies of them.
+        # Structure: {course_id: {person_name: Course}}
+        self.selected_courses: Dict[str, Dict[str, Course]] = {}
+        # Per person: {course_id: number of their selected courses clashing with it}
+        self._clash_counts: Dict[str, Dict[str, int]] = {}
+        # Per person: unselected courses with a non-zero clash count
+        self._conflicting: Dict[str, Set[str]] = {}
+        # Bumped by every selection change
+        self.version = 0
+        # course_id -> its FlatSessions; (version, whole flattened view)
+        self._flat_by_course: Dict[str, List[FlatSession]] = {}
+        self._flat_cache: Tuple[int, List[FlatSession]] = (0, [])
+        # Group busy bitsets, common free cells and pairwise overlaps
+        self.group = GroupAnalytics(self.index)
 
-    def toggle_course(self, course_id: str, person_name: str = ""):
+    def toggle_course(self, course_id: str, person_name: str = "") -> ConflictDelta:
         if not person_name:
             person_name = "default"
         
@@ -21,13 +54,50 @@ class Scheduler:
             # Clean up empty course entries
             if not self.selected_courses[course_id]:
                 del self.selected_courses[course_id]
+            self._selection_changed(course_id)
+            self.group.course_toggled(person_name, course_id, False, self.selected_courses.get(course_id, {}))
+            return self._update_conflicts(course_id, person_name, -1)
         else:
             course = self.all_courses.get(course_id)
             if course:
-                self.selected_courses[course_id][person_name] = {
-                    "half": course["half"],
-                    "sessions": course["sessions"]
-                }
+                self.selected_courses[course_id][person_name] = course
+                self._selection_changed(course_id)
+                self.group.course_toggled(person_name, course_id, True, self.selected_courses[course_id])
+                return self._update_conflicts(course_id, person_name, +1)
+        return ConflictDelta(course_id, person_name, False, frozenset(), frozenset())
+
+    def _update_conflicts(self, course_id: str, person_name: str, step: int) -> ConflictDelta:
+        """
+        Applies one selection (+1) or deselection (-1) to the person's clash
+        counts: only course_id and the courses sharing a cell with it can
+        change state, so only those are touched.
+        """
+        counts = self._clash_counts.setdefault(person_name, {})
+        conflicting = self._conflicting.setdefault(person_name, set())
+        now_conflicting: Set[str] = set()
+        now_available: Set[str] = set()
+
+        for cid in self.index.clashing_with(course_id):
+            counts[cid] = counts.get(cid, 0) + step
+            if not counts[cid]:
+                del counts[cid]
+
+        for cid in self.index.clashing_with(course_id) | {course_id}:
+            is_conflicting = cid in counts and not self.is_selected(cid, person_name)
+            if is_conflicting and cid not in conflicting:
+                conflicting.add(cid)
+                now_conflicting.add(cid)
+            elif not is_conflicting and cid in conflicting:
+                conflicting.discard(cid)
+                now_available.add(cid)
+
+        return ConflictDelta(
+            course_id,
+            person_name,
+            step > 0,
+            frozenset(now_conflicting),
+            frozenset(now_available),
+        )
 
     def is_selected(self, course_id: str, person_name: str = "") -> bool:
         if not person_name:
@@ -38,36 +108,55 @@ class Scheduler:
         """Get all selected course IDs"""
         return set(self.selected_courses.keys())
 
-    def get_selected_courses_flat(self) -> List[Dict]:
+    def get_selected_courses_flat(self) -> List[FlatSession]:
         """
-        Flattens the selected courses into individual session dictionaries
+        Flattens the selected courses into individual FlatSessions
         required by the PDF/ICS generators and the Grid UI.
         Groups people who share the same course and half.
-        Output: [ {'name':..., 'day':..., 'slot':..., 'half':...}, ... ]
+        Output: [ FlatSession(name, half, day, slot, course_id, classroom), ... ]
+        Cached per selection version; toggle_course only re-flattens the
+        course it changed.
         """
+        cached_version, flat_list = self._flat_cache
+        if cached_version != self.version:
+            flat_list = [
+                row
+                for course_id in self.selected_courses
+                for row in self._flat_by_course.get(course_id, ())
+            ]
+            self._flat_cache = (self.version, flat_list)
+        return list(flat_list)
+
+    def _selection_changed(self, course_id: str):
+        self.version += 1
+        rows = self._flatten_course(course_id)
+        if rows:
+            self._flat_by_course[course_id] = rows
+        else:
+            self._flat_by_course.pop(course_id, None)
+
+    def _flatten_course(self, course_id: str) -> List[FlatSession]:
+        """One selected course's FlatSessions, with the names of everyone taking it."""
         flat_list = []
+        course = self.all_courses.get(course_id)
+        people_dict = self.selected_courses.get(course_id)
+        if not course or not people_dict:
+            return flat_list
+
+        # Build a map of (day, slot, half) -> [person names]
+        course_sessions_map: Dict[Tuple[int, int, str], List[str]] = {}
         
-        # Build a map of (course_id, day, slot, half) -> [person names]
-        course_sessions_map: Dict[Tuple[str, str, int, str], List[str]] = {}
-        
-        for course_id, people_dict in self.selected_courses.items():
-            course = self.all_courses.get(course_id)
-            if not course:
-                continue
+        for person_name, person_course in people_dict.items():
+            half = person_course.half
             
-            for person_name, person_data in people_dict.items():
-                half = person_data["half"]
-                sessions = person_data["sessions"]
-                
-                for session in sessions:
-                    key = (course_id, session["day"], session["slot"], half)
-                    if key not in course_sessions_map:
-                        course_sessions_map[key] = []
-                    course_sessions_map[key].append(person_name)
+            for session in person_course.sessions:
+                key = (session.day, session.slot, half)
+                if key not in course_sessions_map:
+                    course_sessions_map[key] = []
+                course_sessions_map[key].append(person_name)
         
         # Convert to flat list with merged names
-        for (course_id, day, slot, half), people_names in course_sessions_map.items():
-            course = self.all_courses.get(course_id)
+        for (day, slot, half), people_names in course_sessions_map.items():
             # Sort names for consistent ordering
             sorted_names = sorted(
                 [n for n in people_names if n != "default"],
@@ -75,30 +164,30 @@ class Scheduler:
             )
             # Display format: "CourseName (Alice/Bob)" or just "CourseName" if default
             if sorted_names:
-                display_name = f"{course['name']} ({'/'.join(sorted_names)})"
+                display_name = f"{course.name} ({'/'.join(sorted_names)})"
             else:
-                display_name = course["name"]
+                display_name = course.name
             
             flat_list.append(
-                {
-                    "name": display_name,
-                    "half": half,
-                    "day": day,
-                    "slot": slot,
-                    "course_id": course_id,  # Track original course for reference
-                    "classroom": course.get("classroom", "TBD"),  # Include classroom
-                }
+                FlatSession(
+                    name=display_name,
+                    half=half,
+                    day=day,
+                    slot=slot,
+                    course_id=course_id,  # Track original course for reference
+                    classroom=course.classroom,
+                )
             )
         
         return flat_list
 
     def _check_session_conflict(
-        self, sess_a: Dict, half_a: str, sess_b: Dict, half_b: str
+        self, sess_a: Session, half_a: str, sess_b: Session, half_b: str
     ) -> bool:
         """Helper to check if two specific sessions conflict."""
-        if sess_a["day"] != sess_b["day"]:
+        if sess_a.day != sess_b.day:
             return False
-        if sess_a["slot"] != sess_b["slot"]:
+        if sess_a.slot != sess_b.slot:
             return False
 
         # H1 vs H2 is NOT a conflict
@@ -107,50 +196,146 @@ class Scheduler:
 
         return True
 
+    def _person_selection(self, person_name: str) -> List[str]:
+        return [
+            cid for cid, people_dict in self.selected_courses.items()
+            if person_name in people_dict
+        ]
+
     def get_conflicting_ids(self, person_name: str = "") -> Set[str]:
         """
         Identifies unselected courses that conflict with the current selection for a specific person.
-        This iterates through all unselected courses -> all their sessions
-        and compares against all selected sessions for that person.
+        Kept up to date by toggle_course, so this is just a copy of the set.
         """
         if not person_name:
             person_name = "default"
-        
-        conflicts = set()
-
-        # 1. Gather all occupied time slots from selected courses for this person
-        # Structure: List of (session_obj, half_str)
-        occupied_slots = []
-        for course_id, people_dict in self.selected_courses.items():
-            if person_name not in people_dict:
-                continue
-            
-            person_data = people_dict[person_name]
-            half = person_data["half"]
-            sessions = person_data["sessions"]
-            
-            for sess in sessions:
-                occupied_slots.append((sess, half))
-
-        if not occupied_slots:
-            return conflicts
-
-        # 2. Check every unselected course
-        for cid, course in self.all_courses.items():
-            if cid in self.selected_courses and person_name in self.selected_courses[cid]:
-                continue
-
-            # Check if ANY session of this course conflicts with ANY occupied slot
-            is_conflict = False
-            for cand_sess in course["sessions"]:
-                for occ_sess, occ_half in occupied_slots:
-                    if self._check_session_conflict(
-                        cand_sess, course["half"], occ_sess, occ_half
-                    ):
-                        conflicts.add(cid)
-                        is_conflict = True
-                        break
-                if is_conflict:
-                    break
-
-        return conflicts
+        return set(self._conflicting.get(person_name, ()))
+
+    def get_group_conflicts(self, person_names: Optional[List[str]] = None) -> Dict[str, Set[str]]:
+        """
+        Conflict sets of many people in one batched matrix query.
+        Defaults to everyone with at least one selection.
+        """
+        if person_names is None:
+            person_names = sorted({
+                p for people_dict in self.selected_courses.values() for p in people_dict
+            })
+        names = [p or "default" for p in person_names]
+        sets = self.index.matrix.conflict_sets([self._person_selection(p) for p in names])
+        return dict(zip(person_names, sets))
+
+    def get_common_free_cells(self, person_names: Optional[List[str]] = None) -> List[Tuple[int, int, str]]:
+        """(day, slot, half) cells, Mon-Sat, where none of the people (default: everyone) has a class."""
+        if person_names is not None:
+            person_names = [p or "default" for p in person_names]
+        return self.group.common_free(person_names)
+
+    def get_group_matrices(self, person_names: Optional[List[str]] = None):
+        """
+        (names, shared, overlap) matrices: shared-course counts and
+        overlapping busy (day, slot, half) cells for every pair of people.
+        """
+        if person_names is not None:
+            person_names = [p or "default" for p in person_names]
+        return self.group.matrices(person_names)
+
+    def get_blocking_ids(self, course_id: str, person_name: str = "") -> List[str]:
+        """The person's selected courses that clash with course_id."""
+        if not person_name:
+            person_name = "default"
+        return self.index.blockers(course_id, self._person_selection(person_name))
+
+    def explain_conflicts(self, person_name: str = "") -> Dict[str, List[str]]:
+        """
+        For every conflicting course, the person's selected courses blocking it.
+        Output: {candidate_id: [blocking_id, ...]}
+        """
+        if not person_name:
+            person_name = "default"
+
+        selected = self._person_selection(person_name)
+        explanation: Dict[str, Set[str]] = {}
+        for sel_id in selected:
+            for cid in self.index.courses_meeting(self.index.cells_of(sel_id)):
+                explanation.setdefault(cid, set()).add(sel_id)
+        for sel_id in selected:
+            explanation.pop(sel_id, None)
+        return {cid: sorted(ids) for cid, ids in explanation.items()}
+
+    def get_available_ids(
+        self, day: int, slot: int, half: str = "BOTH", person_name: str = ""
+    ) -> Set[str]:
+        """
+        Courses meeting at (day, slot, half) that the person could still add:
+        not already selected and not clashing with anything they selected.
+        """
+        if not person_name:
+            person_name = "default"
+
+        conflicting = self._conflicting.get(person_name, set())
+        return {
+            cid for cid in self.index.courses_at(day, slot, half)
+            if cid not in conflicting and not self.is_selected(cid, person_name)
+        }
+
+    def solve_timetable(
+        self,
+        required: List[str],
+        optional: Optional[List[str]] = None,
+        person_name: str = "",
+        keep_selected: bool = True,
+        time_budget: float = 1.0,
+        max_solutions: int = 20,
+        workers: int = 1,
+    ) -> SolverResult:
+        """
+        Finds the maximal conflict-free combinations of a wishlist.
+        Entries are course ids or section names ("Science II" or either of
+        "Science II A"/"Science II B"), and sections are interchangeable.
+        With keep_selected, the person's current selection (outside the
+        wishlist) stays fixed and the solutions must fit around it.
+        """
+        if not person_name:
+            person_name = "default"
+
+        wishes = build_wishes(
+            required, optional or [], self.index.masks, self.catalogue.sections
+        )
+        occupied = 0
+        if keep_selected:
+            wished = {cid for wish in wishes for cid in wish.alternatives}
+            for cid in self._person_selection(person_name):
+                if cid not in wished:
+                    occupied |= self.index.masks.get(cid, 0)
+        return solve(wishes, occupied, time_budget, max_solutions, workers)
+
+    def apply_solution(self, course_ids: List[str], person_name: str = "") -> List[ConflictDelta]:
+        """
+        Selects a solver solution for the person, swapping out any other
+        section of the same course they had selected.
+        """
+        chosen = set(course_ids)
+        deltas = []
+        for sections in self.catalogue.sections.values():
+            if chosen.intersection(sections):
+                for cid in sections:
+                    if cid not in chosen and self.is_selected(cid, person_name):
+                        deltas.append(self.toggle_course(cid, person_name))
+        for cid in course_ids:
+            if not self.is_selected(cid, person_name):
+                deltas.append(self.toggle_course(cid, person_name))
+        return deltas
+
+    def rank_timetables(
+        self, candidates: List[List[str]], k: int = 5, weights: Optional[ScoreWeights] = None
+    ) -> List[RankedTimetable]:
+        """
+        The k best candidate timetables (lists of course ids, e.g. solver
+        solutions) by idle gaps, 8:30 starts, Saturdays, H1/H2 balance and
+        classes on both sides of lunch. Lower penalty is better.
+        """
+        return self.catalogue.scorer.top_k(candidates, k, weights)
+
+    def preview_flat(self, course_ids: List[str]) -> List[FlatSession]:
+        """A candidate's sessions in the shape of get_selected_courses_flat, for TimetableGrid.preview."""
+        return preview_sessions(self.all_courses, course_ids)
@@ -0,0 +1,158 @@
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from .models import DAY_CODES, Course, FlatSession
+from .slot_index import halves_of
+from .utils import DAYS_MAP, TIME_SLOTS
+
+# Tensor axes: candidate x half (H1, H2) x day (DAYS_MAP code) x slot (1-6)
+HALVES = ("H1", "H2")
+SLOTS = sorted(TIME_SLOTS)
+N_CELLS = len(HALVES) * len(DAYS_MAP) * len(SLOTS)
+
+# Slots that start at 8:30, the earliest start in TIME_SLOTS
+EARLY_SLOTS = [
+    i for i, s in enumerate(SLOTS) if TIME_SLOTS[s][0] == TIME_SLOTS[SLOTS[0]][0]
+]
+
+
+def _minutes(t) -> int:
+    return t.hour * 60 + t.minute
+
+
+# The lunch break is the longest gap between two consecutive slots
+LUNCH_BEFORE = max(
+    range(len(SLOTS) - 1),
+    key=lambda i: _minutes(TIME_SLOTS[SLOTS[i + 1]][0])
+    - _minutes(TIME_SLOTS[SLOTS[i]][1]),
+)
+LUNCH_AFTER = LUNCH_BEFORE + 1
+
+METRICS = (
+    "idle_gaps",  # empty slots between a day's first and last class
+    "early_starts",  # days with an 8:30 class
+    "saturday",  # Saturday classes
+    "half_imbalance",  # |H1 load - H2 load|
+    "lunch_clusters",  # days with classes both right before and after lunch
+    "clashes",  # cells holding more than one course
+)
+
+
+class ScoreWeights(NamedTuple):
+    """Penalty per unit of each metric (summed over both halves)."""
+
+    idle_gaps: float = 1.0
+    early_starts: float = 0.5
+    saturday: float = 2.0
+    half_imbalance: float = 0.25
+    lunch_clusters: float = 0.5
+    clashes: float = 100.0
+
+
+class RankedTimetable(NamedTuple):
+    course_ids: Sequence[str]
+    penalty: float  # lower is better
+    metrics: Dict[str, float]
+
+
+class TimetableScorer:
+    """
+    Scores many candidate timetables at once. Each course is a fixed
+    half x day x slot occupancy block, so a batch of candidates is a
+    candidates x courses incidence matrix times the course blocks, and
+    every metric is a reduction over that tensor.
+    """
+
+    def __init__(self, courses: Iterable[Course]):
+        courses = list(courses)
+        self.ids: List[str] = [c.id for c in courses]
+        self.position: Dict[str, int] = {cid: i for i, cid in enumerate(self.ids)}
+        blocks = np.zeros(
+            (len(courses), len(HALVES), len(DAYS_MAP), len(SLOTS)), dtype=np.float32
+        )
+        for i, course in enumerate(courses):
+            for half in halves_of(course.half):
+                for sess in course.sessions:
+                    if sess.slot not in TIME_SLOTS:
+                        continue  # no cell to fill outside the slot grid
+                    blocks[i, HALVES.index(half), sess.day, SLOTS.index(sess.slot)] = 1
+        self._blocks = blocks.reshape(len(courses), N_CELLS)
+
+    def incidence(self, candidates: Sequence[Iterable[str]]) -> np.ndarray:
+        """candidates x courses; unknown ids are ignored."""
+        matrix = np.zeros((len(candidates), len(self.ids)), dtype=np.float32)
+        for row, course_ids in enumerate(candidates):
+            cols = [self.position[cid] for cid in course_ids if cid in self.position]
+            matrix[row, cols] = 1
+        return matrix
+
+    def tensor(self, candidates: Sequence[Iterable[str]]) -> np.ndarray:
+        """Courses per cell: candidates x half x day x slot."""
+        counts = self.incidence(candidates) @ self._blocks
+        return counts.reshape(len(candidates), len(HALVES), len(DAYS_MAP), len(SLOTS))
+
+    @staticmethod
+    def metrics(tensor: np.ndarray) -> np.ndarray:
+        """candidates x METRICS, in METRICS order."""
+        busy = tensor > 0
+        n_slots = busy.shape[-1]
+        per_day = busy.sum(axis=-1)
+        first = busy.argmax(axis=-1)
+        last = n_slots - 1 - busy[..., ::-1].argmax(axis=-1)
+        gaps = np.where(per_day > 0, last - first + 1 - per_day, 0)
+
+        load = per_day.sum(axis=-1)  # candidates x half
+        return np.stack(
+            [
+                gaps.sum(axis=(1, 2)),
+                busy[..., EARLY_SLOTS].any(axis=-1).sum(axis=(1, 2)),
+                per_day[:, :, DAY_CODES["Sat"]].sum(axis=1),
+                np.abs(load[:, 0] - load[:, 1]),
+                (busy[..., LUNCH_BEFORE] & busy[..., LUNCH_AFTER]).sum(axis=(1, 2)),
+                (tensor > 1).sum(axis=(1, 2, 3)),
+            ],
+            axis=1,
+        ).astype(np.float32)
+
+    def score(
+        self,
+        candidates: Sequence[Iterable[str]],
+        weights: Optional[ScoreWeights] = None,
+    ) -> np.ndarray:
+        """Penalty of every candidate (lower is better)."""
+        weights = np.asarray(weights or ScoreWeights(), dtype=np.float32)
+        return self.metrics(self.tensor(candidates)) @ weights
+
+    def top_k(
+        self,
+        candidates: Sequence[Sequence[str]],
+        k: int = 5,
+        weights: Optional[ScoreWeights] = None,
+    ) -> List[RankedTimetable]:
+        """The k best candidates, best first (ties keep candidate order)."""
+        if not candidates:
+            return []
+        weights = np.asarray(weights or ScoreWeights(), dtype=np.float32)
+        metrics = self.metrics(self.tensor(candidates))
+        penalties = metrics @ weights
+        best = np.argsort(penalties, kind="stable")[:k]
+        return [
+            RankedTimetable(
+                candidates[i],
+                float(penalties[i]),
+                dict(zip(METRICS, metrics[i].tolist())),
+            )
+            for i in best
+        ]
+
+
+def preview_sessions(
+    courses: Mapping[str, Course], course_ids: Iterable[str]
+) -> List[FlatSession]:
+    """A candidate as the FlatSessions TimetableGrid.update/preview draws."""
+    return [
+        FlatSession(c.name, c.half, sess.day, sess.slot, c.id, c.classroom)
+        for c in (courses[cid] for cid in course_ids if cid in courses)
+        for sess in c.sessions
+    ]
@@ -1,9 +1,122 @@
+import hashlib
 import json
+import multiprocessing
 import os
-import re
-from typing import Any, Dict, List
-
-import pdfplumber
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .fuzzy import BLANK, FuzzyTermIndex
+from .matcher import TermMatcher
+from .normalize import NameNormalizer
+from .profiling import ScrapeProfiler, profile_stage
+from .table_cache import MISSING, PageTableCache
+from .word_grid import WORD_GRID_VERSION, extract_word_grid
+
+# pdfplumber is imported inside the scraping functions so that loading a
+# cached courses.json does not pay for importing it.
+
+
+# --- Page Extraction ---
+# Kept at module level so worker processes can import and run them.
+def _extract_from_page(
+    page, kind: str, slot_columns: Optional[Dict[int, int]] = None
+) -> Any:
+    """
+    "tables": page.extract_tables(), "table": page.extract_table(),
+    "words": the word-coordinate grid laid out in `slot_columns` (default
+    CourseScraper.SLOT_COLUMNS), falling back to extract_table() on pages
+    whose header row cannot be calibrated.
+    """
+    if kind == "tables":
+        return page.extract_tables()
+    if kind == "words":
+        grid = extract_word_grid(page, slot_columns or CourseScraper.SLOT_COLUMNS)
+        if grid is not None:
+            return grid
+    return page.extract_table()
+
+
+def _iter_page_tables(
+    pdf_path: str,
+    offset: int,
+    stride: int,
+    page_limit: Optional[int],
+    kind: str,
+    cache_dir: Optional[str] = None,
+    profiler: Optional[ScrapeProfiler] = None,
+    cache_version: str = "",
+    slot_columns: Optional[Dict[int, int]] = None,
+) -> Iterator[Tuple[int, Any]]:
+    """
+    Yields (page_idx, tables) for every `stride`-th page starting at `offset`,
+    where tables is what _extract_from_page returns for `kind`.
+    Each page's parsed objects are released once its tables are taken, so memory
+    does not grow with the page count.
+    With a `cache_dir`, pages whose content is unchanged are read from the
+    PageTableCache (entries tagged `cache_version`) instead of running table
+    detection again.
+    """
+    import pdfplumber
+
+    cache = PageTableCache(cache_dir, cache_version) if cache_dir else None
+    source = os.path.basename(pdf_path)
+
+    with profile_stage(profiler, "pdf_open"):
+        pdf = pdfplumber.open(pdf_path)
+        stop = len(pdf.pages)
+    with pdf:
+        if page_limit is not None:
+            stop = min(stop, page_limit)
+        for page_idx in range(offset, stop, stride):
+            page = pdf.pages[page_idx]
+            try:
+                with profile_stage(profiler, "extract_tables", (source, page_idx)):
+                    tables = MISSING
+                    if cache:
+                        key = cache.page_key(page, kind)
+                        tables = cache.get(key)
+                    if tables is MISSING:
+                        tables = _extract_from_page(page, kind, slot_columns)
+                        if cache:
+                            cache.put(key, tables)
+                    elif profiler:
+                        profiler.count("cache_hits")
+            finally:
+                page.close()
+            yield page_idx, tables
+
+
+def _extract_page_range(
+    pdf_path: str,
+    offset: int,
+    stride: int,
+    page_limit: Optional[int],
+    kind: str,
+    cache_dir: Optional[str] = None,
+    profile: bool = False,
+    cache_version: str = "",
+    slot_columns: Optional[Dict[int, int]] = None,
+) -> Tuple[List[Tuple[int, Any]], Optional[ScrapeProfiler]]:
+    """
+    List form of _iter_page_tables, returned from worker processes together
+    with the worker's profiler (when `profile` is set) for the parent to merge.
+    """
+    profiler = ScrapeProfiler() if profile else None
+    pages = list(
+        _iter_page_tables(
+            pdf_path,
+            offset,
+            stride,
+            page_limit,
+            kind,
+            cache_dir,
+            profiler,
+            cache_version,
+            slot_columns,
+        )
+    )
+    return pages, profiler
 
 
 class CourseScraper:
@@ -55,130 +168,293 @@ class CourseScraper:
         "SCIENCE LAB II": ["SCIENCE LAB II", "SCIENCE LAB 2", "SCIENCE LAB-II"],
     }
 
+    # Only the first pages of courses.pdf hold the course list
+    COURSES_PDF_PAGES = 7
+
+    # Timetable column holding each slot (columns 4-5 are the lunch break)
+    SLOT_COLUMNS = {1: 1, 2: 2, 3: 3, 4: 6, 5: 7, 6: 8}
+
+    # How timetable pages are turned into rows: pdfplumber table detection,
+    # or the word-coordinate grid (see word_grid.py)
+    EXTRACTION_BACKENDS = ("table", "words")
+
+    # --- CONFIGURATION: Fuzzy matching (only with fuzzy=True) ---
+    # Edits allowed per character of a term before a cell stops matching it,
+    # and the looser budget under which it is still reported as a near miss.
+    FUZZY_MAX_ERROR_RATIO = 0.15
+    FUZZY_NEAR_MISS_RATIO = 0.3
+    # Shorter terms are only ever matched exactly
+    FUZZY_MIN_TERM_LENGTH = 8
+
+    # Class attributes that change the scrape output; part of the cache key
+    CONFIG_TABLES = (
+        "TWO_SLOT_COURSES",
+        "BLACKLIST_COURSES",
+        "HALF_OVERRIDES",
+        "NAME_CORRECTIONS",
+        "ALIAS_MAP",
+        "COURSES_PDF_PAGES",
+        "SLOT_COLUMNS",
+        "FUZZY_MAX_ERROR_RATIO",
+        "FUZZY_NEAR_MISS_RATIO",
+        "FUZZY_MIN_TERM_LENGTH",
+    )
+
     def __init__(
-        self, timetable_path: str = "timetable.pdf", courses_path: str = "courses.pdf"
+        self,
+        timetable_path: str = "timetable.pdf",
+        courses_path: str = "courses.pdf",
+        workers: int = 1,
+        cache_dir: Optional[str] = None,
+        backend: str = "table",
+        profiler: Optional[ScrapeProfiler] = None,
+        fuzzy: bool = False,
+        mp_context: Optional[str] = None,
     ):
+        if backend not in self.EXTRACTION_BACKENDS:
+            raise ValueError(f"Unknown extraction backend: {backend}")
         self.timetable_path = timetable_path
         self.courses_path = courses_path
-
-    def clean_text(self, text: str) -> str:
-        if not text:
+        # workers > 1 extracts pages of both PDFs in a process pool
+        self.workers = max(1, workers)
+        # Start method of that pool ("fork", "spawn", ...; None = platform default)
+        self.mp_context = mp_context
+        # Directory for the per-page table cache (None disables it)
+        self.cache_dir = cache_dir
+        self.backend = backend
+        # Optional stage/page timing (see extract_courses_with_report)
+        self.profiler = profiler
+        # Memoised clean_text / parse_half_from_string / get_official_name
+        self.normalizer = NameNormalizer(self.NAME_CORRECTIONS)
+        # Fall back to approximate matching for text no term matched exactly
+        self.fuzzy = fuzzy
+        # Filled by a fuzzy scrape: sessions found approximately, and close
+        # calls that were rejected (worth a NAME_CORRECTIONS/ALIAS_MAP entry)
+        self.fuzzy_matches: List[Dict[str, Any]] = []
+        self.near_misses: List[Dict[str, Any]] = []
+
+    @classmethod
+    def config_fingerprint(cls) -> str:
+        """Stable hash of the configuration tables listed in CONFIG_TABLES."""
+        config = {}
+        for name in cls.CONFIG_TABLES:
+            value = getattr(cls, name)
+            config[name] = (
+                sorted(value) if isinstance(value, (set, frozenset)) else value
+            )
+        encoded = json.dumps(config, sort_keys=True).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    def _cache_version(self, kind: str) -> str:
+        """
+        Tags page cache entries of `kind` with what the raw tables depend
+        on. Only the word grid does (its code and SLOT_COLUMNS); name and
+        half corrections are applied after the cache, so editing them
+        keeps every cached page.
+        """
+        if kind != "words":
             return ""
+        # SLOT_COLUMNS again, in case it was overridden on the instance
+        columns = sorted(self.SLOT_COLUMNS.items())
+        return f"{WORD_GRID_VERSION}|{columns}"
 
-        text = text.replace("\n", " ").replace("\r", " ")
-        text = re.sub(r"\s+", " ", text)
+    def _stage(self, name: str, page=None):
+        return profile_stage(self.profiler, name, page)
 
-        text = re.sub(r"\bIntro[\.:]?\b", "Introduction", text, flags=re.IGNORECASE)
-        text = text.replace("&", " and ")
-        text = re.sub(r"\bAnd\b", "and", text, flags=re.IGNORECASE)
-
-        # Normalize Roman Numerals (Space + I/II)
-        text = re.sub(r"\s*-\s*(I|II)\b", r" \1", text)
-        text = re.sub(r"\s+(I|II)$", r" \1", text)
-
-        text = re.sub(r"\s+", " ", text).strip()
-        return text
+    # The "normalize" stage is timed by the callers, once per table: a
+    # profiler frame per call would cost more than the memoised lookups.
+    def clean_text(self, text: str) -> str:
+        return self.normalizer.clean_text(text)
 
     def parse_half_from_string(self, text: str) -> str:
-        upper = text.upper()
-        if any(x in upper for x in ["H1+H2", "H1/H2", "H1&H2", "(H1,H2)", "H1 AND H2"]):
-            return "BOTH"
-
-        has_h1 = bool(re.search(r"\(H1\)| H1 |^H1 | H1$", upper)) or ("(H1)" in upper)
-        has_h2 = bool(re.search(r"\(H2\)| H2 |^H2 | H2$", upper)) or ("(H2)" in upper)
-
-        if has_h1 and not has_h2:
-            return "H1"
-        if has_h2 and not has_h1:
-            return "H2"
-        return "BOTH"
+        return self.normalizer.parse_half_from_string(text)
 
     def get_official_name(self, raw_name: str) -> str:
-        if raw_name in self.NAME_CORRECTIONS:
-            raw_name = self.NAME_CORRECTIONS[raw_name]
-
-        def replacement(match):
-            content = match.group(1).strip()
-            content_upper = content.upper()
-
-            if re.match(r"^H[12]?(\s*(AND|[+&/])\s*H[12]?)?$", content_upper):
-                return ""
-            if content_upper.startswith("MAX") or content_upper.startswith("LIMIT"):
-                return ""
-            if content.isdigit():
-                return ""
-            return match.group(0)
-
-        cleaned = re.sub(r"\(([^)]*)\)", replacement, raw_name)
-        cleaned = cleaned.replace("  ", " ").strip()
-        cleaned = cleaned.rstrip(".,").strip()
-        return cleaned
+        return self.normalizer.get_official_name(raw_name)
 
     def get_search_term(self, official_name: str) -> str:
         return official_name.strip()
 
-    def get_master_course_list(self) -> Dict[str, Dict]:
+    def get_master_course_list(
+        self, page_tables: Optional[List[List]] = None
+    ) -> Dict[str, Dict]:
+        """
+        Builds the course registry from courses.pdf.
+        `page_tables` (one extract_tables() result per page) can be passed in
+        when the pages were already extracted, e.g. by the parallel scrape.
+        """
         registry = {}
-        if not os.path.exists(self.courses_path):
+        if page_tables is None and not os.path.exists(self.courses_path):
             print(f"Error: {self.courses_path} not found.")
             return {}
 
         try:
-            with pdfplumber.open(self.courses_path) as pdf:
-                for page_idx in range(7):
-                    if page_idx >= len(pdf.pages):
-                        break
-                    page = pdf.pages[page_idx]
-                    tables = page.extract_tables()
-
-                    for table in tables:
-                        if not table or len(table[0]) < 3:
-                            continue
+            if page_tables is None:
+                page_tables = [
+                    tables
+                    for _, tables in _iter_page_tables(
+                        self.courses_path,
+                        0,
+                        1,
+                        self.COURSES_PDF_PAGES,
+                        "tables",
+                        self.cache_dir,
+                        self.profiler,
+                        self._cache_version("tables"),
+                    )
+                ]
+
+            source = os.path.basename(self.courses_path)
+            for page_idx, tables in enumerate(page_tables):
+                with self._stage("registry", (source, page_idx)):
+                    self._register_page(registry, page_idx, tables)
+        except Exception as e:
+            print(f"Error parsing courses.pdf: {e}")
+            return {}
 
-                        start_row = 1 if page_idx == 0 else 0
-                        name_idx = 2
+        return registry
 
-                        for row in table[start_row:]:
-                            if len(row) <= name_idx:
-                                continue
-                            raw_name = row[name_idx]
-                            if not raw_name:
-                                continue
+    def _register_page(self, registry: Dict[str, Dict], page_idx: int, tables: List):
+        for table in tables:
+            if not table or len(table[0]) < 3:
+                continue
 
-                            raw_name_clean = self.clean_text(raw_name)
-                            if len(raw_name_clean) < 3 or raw_name_clean.isdigit():
-                                continue
+            start_row = 1 if page_idx == 0 else 0
+            name_idx = 2
+
+            # (official name, half tag) of every usable row
+            entries = []
+            with self._stage("normalize"):
+                for row in table[start_row:]:
+                    if len(row) <= name_idx:
+                        continue
+                    raw_name = row[name_idx]
+                    if not raw_name:
+                        continue
+
+                    raw_name_clean = self.clean_text(raw_name)
+                    if len(raw_name_clean) < 3 or raw_name_clean.isdigit():
+                        continue
+
+                    entries.append(
+                        (
+                            self.get_official_name(raw_name_clean),
+                            self.parse_half_from_string(raw_name_clean),
+                        )
+                    )
 
-                            official_name = self.get_official_name(raw_name_clean)
+            for official_name, half_tag in entries:
+                if official_name in self.BLACKLIST_COURSES:
+                    continue
 
-                            if official_name in self.BLACKLIST_COURSES:
-                                continue
+                if official_name.upper() in self.HALF_OVERRIDES:
+                    half_tag = self.HALF_OVERRIDES[official_name.upper()]
 
-                            half_tag = self.parse_half_from_string(raw_name_clean)
-                            if official_name.upper() in self.HALF_OVERRIDES:
-                                half_tag = self.HALF_OVERRIDES[official_name.upper()]
+                search_term = self.get_search_term(official_name)
 
-                            search_term = self.get_search_term(official_name)
+                if len(search_term) < 2:
+                    continue
 
-                            if len(search_term) < 2:
-                                continue
+                registry[search_term] = {
+                    "official_name": official_name,
+                    "half": half_tag,
+                }
+
+    def _extract_tables_parallel(self) -> Tuple[Optional[List], Optional[List]]:
+        """
+        Extracts the pages of courses.pdf and timetable.pdf in one process pool.
+        Pages are split round-robin across the workers and reassembled in page
+        order, so the result does not depend on which worker finishes first.
+        Returns (courses_page_tables, timetable_page_tables); None for a missing PDF.
+        Raises RuntimeError if a worker fails, rather than scraping half the pages.
+        """
+        jobs = {}
+        if os.path.exists(self.courses_path):
+            jobs["courses"] = (self.courses_path, self.COURSES_PDF_PAGES, "tables")
+        if os.path.exists(self.timetable_path):
+            jobs["timetable"] = (self.timetable_path, None, self._timetable_kind())
+
+        results: Dict[str, Optional[List]] = {"courses": None, "timetable": None}
+        if not jobs:
+            return results["courses"], results["timetable"]
+
+        context = (
+            multiprocessing.get_context(self.mp_context) if self.mp_context else None
+        )
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=context) as pool:
+            futures = {
+                key: [
+                    pool.submit(
+                        _extract_page_range,
+                        path,
+                        offset,
+                        self.workers,
+                        limit,
+                        kind,
+                        self.cache_dir,
+                        self.profiler is not None,
+                        self._cache_version(kind),
+                        self.SLOT_COLUMNS,
+                    )
+                    for offset in range(self.workers)
+                ]
+                for key, (path, limit, kind) in jobs.items()
+            }
+            for key, key_futures in futures.items():
+                by_page = {}
+                try:
+                    for future in key_futures:
+                        pages, worker_profiler = future.result()
+                        by_page.update(pages)
+                        if worker_profiler:
+                            self.profiler.merge(worker_profiler)
+                except Exception as e:
+                    raise RuntimeError(f"Error extracting {jobs[key][0]}: {e}") from e
+                results[key] = [by_page[idx] for idx in sorted(by_page)]
+
+        return results["courses"], results["timetable"]
 
-                            registry[search_term] = {
-                                "official_name": official_name,
-                                "half": half_tag,
-                            }
-        except Exception as e:
-            print(f"Error parsing courses.pdf: {e}")
-            return {}
+    def extract_courses(self) -> List[Dict[str, Any]]:
+        courses_db: Dict[str, Dict] = {}
+        for _ in self.iter_page_results(courses_db):
+            pass
 
-        return registry
+        final_courses = list(courses_db.values())
+        final_courses.sort(key=lambda x: x["name"])
+        return final_courses
 
-    def extract_courses(self) -> List[Dict[str, Any]]:
-        registry_map = self.get_master_course_list()
+    def extract_courses_with_report(self) -> Tuple[List[Dict[str, Any]], Dict]:
+        """extract_courses() plus the ScrapeProfiler report of the run."""
+        if self.profiler is None:
+            self.profiler = ScrapeProfiler()
+        courses = self.extract_courses()
+        return courses, self.profiler.report()
+
+    def iter_page_results(
+        self, courses_db: Optional[Dict[str, Dict]] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Streams the timetable scrape one page at a time.
+        Yields {"page": idx, "days": [...], "matches": [{"id", "day", "slot"}, ...]}
+        as soon as a page is scanned; each pdfplumber page is closed before the
+        next one is parsed. `courses_db` (search term -> course record) is
+        filled in as the pages go by, so callers wanting the final records can
+        pass in a dict and read it once the generator is exhausted.
+        """
+        if courses_db is None:
+            courses_db = {}
+
+        course_tables, timetable_tables = None, None
+        if self.workers > 1:
+            course_tables, timetable_tables = self._extract_tables_parallel()
+            if course_tables is None:
+                print(f"Error: {self.courses_path} not found.")
+                return
+
+        registry_map = self.get_master_course_list(course_tables)
         if not registry_map:
-            return []
+            return
 
-        courses_db = {}
         for term, meta in registry_map.items():
             courses_db[term] = {
                 "id": meta["official_name"],
@@ -189,30 +465,119 @@ class CourseScraper:
             }
 
         sorted_search_terms = sorted(registry_map.keys(), key=len, reverse=True)
+        with self._stage("build_matcher"):
+            matcher = self.build_matcher(sorted_search_terms)
+            fuzzy_index = self.build_fuzzy_index(sorted_search_terms)
+        self.fuzzy_matches, self.near_misses = [], []
 
         try:
-            if os.path.exists(self.timetable_path):
-                with pdfplumber.open(self.timetable_path) as pdf:
-                    for i, page in enumerate(pdf.pages):
-                        days = (
-                            ["Mon", "Tue", "Wed"] if i == 0 else ["Thu", "Fri", "Sat"]
-                        )
-                        self._scan_page(page, days, courses_db, sorted_search_terms)
+            if timetable_tables is not None:
+                pages = enumerate(timetable_tables)
+            elif os.path.exists(self.timetable_path):
+                pages = _iter_page_tables(
+                    self.timetable_path,
+                    0,
+                    1,
+                    None,
+                    self._timetable_kind(),
+                    self.cache_dir,
+                    self.profiler,
+                    self._cache_version(self._timetable_kind()),
+                    self.SLOT_COLUMNS,
+                )
+            else:
+                pages = iter(())
+
+            source = os.path.basename(self.timetable_path)
+            for i, raw_table in pages:
+                days = self._page_days(i)
+                with self._stage("match", (source, i)):
+                    matches = self._scan_table(
+                        raw_table, days, courses_db, matcher, fuzzy_index, i
+                    )
+                yield {"page": i, "days": days, "matches": matches}
         except Exception as e:
             print(f"Error reading timetable: {e}")
 
-        final_courses = list(courses_db.values())
-        final_courses.sort(key=lambda x: x["name"])
-        return final_courses
+        if self.cache_dir:
+            PageTableCache(self.cache_dir).prune()
+
+        if self.profiler:
+            self.profiler.extra["registry_terms"] = len(courses_db)
+            self.profiler.extra["unmatched_terms"] = sorted(
+                term for term, course in courses_db.items() if not course["sessions"]
+            )
+            self.profiler.extra["normalize_cache"] = self.normalizer.cache_stats()
+            if self.fuzzy:
+                self.profiler.extra["fuzzy_matches"] = self.fuzzy_matches
+                self.profiler.extra["near_misses"] = self.near_misses
+
+    def _timetable_kind(self) -> str:
+        return "words" if self.backend == "words" else "table"
+
+    def compare_backends(self) -> Dict[str, Any]:
+        """
+        Scrapes the same PDFs once per extraction backend (page cache off) and
+        reports wall time per backend plus every course whose sessions or
+        half differ from the table-based result.
+        """
+        timings, results = {}, {}
+        for backend in self.EXTRACTION_BACKENDS:
+            scraper = type(self)(
+                timetable_path=self.timetable_path,
+                courses_path=self.courses_path,
+                workers=self.workers,
+                backend=backend,
+            )
+            start = time.perf_counter()
+            courses = scraper.extract_courses()
+            timings[backend] = round(time.perf_counter() - start, 4)
+            results[backend] = {c["id"]: c for c in courses}
+
+        differences = []
+        base, other = results["table"], results["words"]
+        for cid in sorted(set(base) | set(other)):
+            base_c, other_c = base.get(cid), other.get(cid)
+            base_sess = {
+                (s["day"], s["slot"]) for s in (base_c or {}).get("sessions", [])
+            }
+            other_sess = {
+                (s["day"], s["slot"]) for s in (other_c or {}).get("sessions", [])
+            }
+            base_half = base_c["half"] if base_c else None
+            other_half = other_c["half"] if other_c else None
+            if base_sess == other_sess and base_half == other_half:
+                continue
+            differences.append(
+                {
+                    "id": cid,
+                    "only_table": sorted(base_sess - other_sess),
+                    "only_words": sorted(other_sess - base_sess),
+                    "half": {"table": base_half, "words": other_half},
+                }
+            )
+
+        return {
+            "timings": timings,
+            "courses": {backend: len(r) for backend, r in results.items()},
+            "differences": differences,
+        }
+
+    def _page_days(self, page_idx: int) -> List[str]:
+        return ["Mon", "Tue", "Wed"] if page_idx == 0 else ["Thu", "Fri", "Sat"]
 
     def _merge_broken_rows(self, raw_table: List[List[str]]) -> List[List[str]]:
         merged_table = []
         if not raw_table:
             return []
 
-        for row in raw_table:
-            clean_row = [self.clean_text(cell) if cell else "" for cell in row]
+        with self._stage("normalize"):
+            clean_rows = [
+                [self.clean_text(cell) if cell else "" for cell in row]
+                for row in raw_table
+            ]
 
+        for clean_row in clean_rows:
             is_continuation = (not clean_row[0]) and any(clean_row)
 
             if is_continuation and merged_table:
@@ -228,16 +593,47 @@ class CourseScraper:
                 merged_table.append(clean_row)
         return merged_table
 
-    def _scan_page(
-        self, page, days: List[str], courses_db: Dict, search_terms: List[str]
-    ):
-        raw_table = page.extract_table()
+    def build_matcher(self, search_terms: List[str]) -> TermMatcher:
+        """Compiles the registry terms, ALIAS_MAP and TWO_SLOT_COURSES into one matcher."""
+        return TermMatcher(search_terms, self.ALIAS_MAP, self.TWO_SLOT_COURSES)
+
+    def build_fuzzy_index(self, search_terms: List[str]) -> Optional[FuzzyTermIndex]:
+        """N-gram index over the same terms (same order) as build_matcher, if fuzzy."""
+        if not self.fuzzy:
+            return None
+        return FuzzyTermIndex(
+            search_terms,
+            self.FUZZY_MAX_ERROR_RATIO,
+            self.FUZZY_NEAR_MISS_RATIO,
+            self.FUZZY_MIN_TERM_LENGTH,
+        )
+
+    def _scan_table(
+        self,
+        raw_table: Optional[List[List[str]]],
+        days: List[str],
+        courses_db: Dict,
+        matcher: TermMatcher,
+        fuzzy_index: Optional[FuzzyTermIndex] = None,
+        page: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Scans one page's table into courses_db; returns the sessions it matched."""
+        matches: List[Dict[str, Any]] = []
         if not raw_table:
-            return
-
-        clean_table = self._merge_broken_rows(raw_table)
+            return matches
+
+        with self._stage("merge_rows"):
+            clean_table = self._merge_broken_rows(raw_table)
+        # Semester half written in each slot cell
+        with self._stage("normalize"):
+            halves = {
+                row[col_idx]: self.parse_half_from_string(row[col_idx])
+                for row in clean_table
+                for col_idx in self.SLOT_COLUMNS.values()
+                if col_idx < len(row) and row[col_idx]
+            }
         current_day_idx = 0
-        SLOT_MAP = {1: 1, 2: 2, 3: 3, 4: 6, 5: 7, 6: 8}
+        cell_count = 0
 
         for row in clean_table:
             if current_day_idx >= len(days):
@@ -248,67 +644,106 @@ class CourseScraper:
 
             day_name = days[current_day_idx]
 
-            for slot_num, col_idx in SLOT_MAP.items():
+            for slot_num, col_idx in self.SLOT_COLUMNS.items():
                 if col_idx >= len(row):
                     continue
                 cell_content = row[col_idx]
                 if not cell_content:
                     continue
-                temp_content_upper = cell_content.upper()
-
-                for term in search_terms:
-                    term_upper = term.upper()
-
-                    match_found = term_upper in temp_content_upper
-                    matched_text = term_upper
-
-                    if not match_found:
-                        aliases = self.ALIAS_MAP.get(term_upper, [])
-                        for alias in aliases:
-                            if alias in temp_content_upper:
-                                match_found = True
-                                matched_text = alias
-                                break
-
-                    if match_found:
-                        local_half = self.parse_half_from_string(cell_content)
-                        current_half = courses_db[term]["half"]
-                        course_id = courses_db[term]["id"].upper()
-
-                        if course_id in self.HALF_OVERRIDES:
-                            courses_db[term]["half"] = self.HALF_OVERRIDES[course_id]
-                        else:
-                            if current_half == "BOTH" and local_half != "BOTH":
-                                courses_db[term]["half"] = local_half
-
-                        def add_session(s_num):
-                            sess = {"day": day_name, "slot": s_num}
-                            if sess not in courses_db[term]["sessions"]:
-                                courses_db[term]["sessions"].append(sess)
-
-                        add_session(slot_num)
-
-                        is_two_slot = False
-                        for ts_name in self.TWO_SLOT_COURSES:
-                            if ts_name in term_upper:
-                                is_two_slot = True
-                                break
-                        if not is_two_slot and term_upper in self.ALIAS_MAP:
-                            for alias in self.ALIAS_MAP[term_upper]:
-                                for ts_name in self.TWO_SLOT_COURSES:
-                                    if ts_name in alias:
-                                        is_two_slot = True
-                                        break
-
-                        if is_two_slot and slot_num < 6:
-                            add_session(slot_num + 1)
-
-                        temp_content_upper = temp_content_upper.replace(
-                            matched_text, " " * len(matched_text)
-                        )
+                cell_count += 1
+                cell_upper = cell_content.upper()
+                found = matcher.match(cell_upper)
+                for term, _, is_two_slot in found:
+                    self._record_session(
+                        term,
+                        halves[cell_content],
+                        is_two_slot,
+                        day_name,
+                        slot_num,
+                        courses_db,
+                        matches,
+                    )
+
+                if fuzzy_index is None:
+                    continue
+                # Only text no term claimed exactly is matched approximately
+                for _, pattern, _ in found:
+                    cell_upper = cell_upper.replace(pattern, BLANK * len(pattern))
+                exact_ids = {matcher.term_ids[term] for term, _, _ in found}
+                with self._stage("fuzzy"):
+                    hits, near = fuzzy_index.match(cell_upper, exact_ids)
+                where = {"page": page, "day": day_name, "slot": slot_num}
+                for hit in hits:
+                    term = matcher.terms[hit.term_idx]
+                    self._record_session(
+                        term,
+                        halves[cell_content],
+                        matcher.is_two_slot(hit.term_idx),
+                        day_name,
+                        slot_num,
+                        courses_db,
+                        matches,
+                    )
+                    self.fuzzy_matches.append(
+                        {
+                            **where,
+                            "cell": cell_content,
+                            "term": term,
+                            "distance": hit.distance,
+                        }
+                    )
+                for hit in near:
+                    self.near_misses.append(
+                        {
+                            **where,
+                            "cell": cell_content,
+                            "term": matcher.terms[hit.term_idx],
+                            "distance": hit.distance,
+                            "allowed": fuzzy_index.max_errors[hit.term_idx],
+                        }
+                    )
 
             current_day_idx += 1
 
+        if self.profiler:
+            self.profiler.count("cells", cell_count)
+            self.profiler.count("matches", len(matches))
+        return matches
+
+    def _record_session(
+        self,
+        term: str,
+        local_half: str,
+        is_two_slot: bool,
+        day_name: str,
+        slot_num: int,
+        courses_db: Dict,
+        matches: List[Dict[str, Any]],
+    ):
+        """
+        Adds a matched cell's session(s) to courses_db[term] and to `matches`.
+        `local_half` is the half written in the cell itself.
+        """
+        current_half = courses_db[term]["half"]
+        course_id = courses_db[term]["id"].upper()
+
+        if course_id in self.HALF_OVERRIDES:
+            courses_db[term]["half"] = self.HALF_OVERRIDES[course_id]
+        else:
+            if current_half == "BOTH" and local_half != "BOTH":
+                courses_db[term]["half"] = local_half
+
+        def add_session(s_num):
+            sess = {"day": day_name, "slot": s_num}
+            if sess not in courses_db[term]["sessions"]:
+                courses_db[term]["sessions"].append(sess)
+            matches.append({"id": courses_db[term]["id"], **sess})
+
+        add_session(slot_num)
+
+        if is_two_slot and slot_num < 6:
+            add_session(slot_num + 1)
+
 
 # --- Helpers ---
 def save_courses_to_json(courses: List[Dict], filename: str = "courses.json"):
@@ -339,32 +774,162 @@ def load_manual_courses(filename: str = "courses_manual.json") -> List[Dict]:
         return []
 
 
+def file_digest(path: str) -> Optional[str]:
+    """SHA-256 of a file's contents, or None if it does not exist."""
+    if not os.path.exists(path):
+        return None
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_manifest_path(json_path: str) -> str:
+    """courses.json -> courses.manifest.json"""
+    return os.path.splitext(json_path)[0] + ".manifest.json"
+
+
+def build_scrape_manifest(
+    timetable_pdf: str,
+    courses_pdf: str,
+    manual_path: str,
+    backend: str = "table",
+    fuzzy: bool = False,
+) -> Dict[str, Optional[str]]:
+    """Fingerprints of every input that goes into courses.json."""
+    return {
+        "timetable": file_digest(timetable_pdf),
+        "courses": file_digest(courses_pdf),
+        "manual": file_digest(manual_path),
+        "config": CourseScraper.config_fingerprint(),
+        "backend": backend,
+        "fuzzy": fuzzy,
+    }
+
+
+def load_scrape_manifest(filename: str) -> Dict[str, Optional[str]]:
+    try:
+        with open(filename, "r") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def save_scrape_manifest(manifest: Dict[str, Optional[str]], filename: str):
+    try:
+        with open(filename, "w") as f:
+            json.dump(manifest, f, indent=4)
+    except Exception as e:
+        print(f"Error saving scrape manifest: {e}")
+
+
+def is_scrape_current(
+    json_path: str,
+    manifest: Dict[str, Optional[str]],
+) -> bool:
+    """
+    True when courses.json can be reused for these inputs: it exists and its
+    manifest matches, it has no manifest yet (a courses.json shipped with the
+    repo is adopted as built from the current inputs), or the PDFs are absent
+    so there is nothing to rebuild from.
+    """
+    if not os.path.exists(json_path):
+        return False
+    if manifest["timetable"] is None or manifest["courses"] is None:
+        return True
+    manifest_path = get_manifest_path(json_path)
+    if not os.path.exists(manifest_path):
+        return True
+    return same_scrape_inputs(load_scrape_manifest(manifest_path), manifest)
+
+
+def same_scrape_inputs(
+    saved: Dict[str, Optional[str]], manifest: Dict[str, Optional[str]]
+) -> bool:
+    """Compares a saved manifest with fresh fingerprints, ignoring its "failed" flag."""
+    return {k: v for k, v in saved.items() if k != "failed"} == manifest
+
+
 def get_course_data(
     json_path: str = "courses.json",
     manual_path: str = "courses_manual.json",
     timetable_pdf: str = "timetable.pdf",
     courses_pdf: str = "courses.pdf",
     force_scrape: bool = False,
+    workers: int = 1,
+    cache_dir: Optional[str] = ".scrape_cache",
+    backend: str = "table",
+    profiler: Optional[ScrapeProfiler] = None,
+    fuzzy: bool = False,
+    mp_context: Optional[str] = None,
 ) -> List[Dict]:
     """
     1. Scrapes or loads courses.json.
+       courses.json is reused while its manifest matches the current hashes of
+       the PDFs, courses_manual.json and the scraper configuration. A scrape
+       that returns nothing is recorded in the manifest, so the same inputs
+       are not scraped again on every start (force_scrape retries).
     2. Loads courses_manual.json.
     3. Merges them. Manual entries can OVERWRITE or DELETE scraped entries.
+    Pass a ScrapeProfiler to get stage timings of the scrape (if one runs).
+    `workers` and `mp_context` are passed on to CourseScraper.
     """
-    should_scrape = force_scrape or not os.path.exists(json_path)
+    manifest_path = get_manifest_path(json_path)
+    manifest = build_scrape_manifest(
+        timetable_pdf, courses_pdf, manual_path, backend, fuzzy
+    )
+    have_json = os.path.exists(json_path)
+    saved = load_scrape_manifest(manifest_path)
+
+    if force_scrape:
+        should_scrape = True
+    elif saved.get("failed") and same_scrape_inputs(saved, manifest):
+        print("The last scrape of these inputs failed; force a scrape to retry.")
+        should_scrape = False
+    else:
+        should_scrape = not is_scrape_current(json_path, manifest)
+        if have_json and should_scrape:
+            print("Scrape inputs changed since courses.json was built.")
+        elif have_json and not os.path.exists(manifest_path):
+            print(f"Adopting {json_path} as built from the current inputs.")
+            save_scrape_manifest(manifest, manifest_path)
 
     scraped_data = []
 
     # 1. Get Scraped Data
     if should_scrape:
         print("Scraping fresh data...")
-        scraper = CourseScraper(timetable_path=timetable_pdf, courses_path=courses_pdf)
-        scraped_data = scraper.extract_courses()
+        scraper = CourseScraper(
+            timetable_path=timetable_pdf,
+            courses_path=courses_pdf,
+            workers=workers,
+            cache_dir=cache_dir,
+            backend=backend,
+            profiler=profiler,
+            fuzzy=fuzzy,
+            mp_context=mp_context,
+        )
+        try:
+            scraped_data = scraper.extract_courses()
+        except Exception as e:
+            print(f"Scrape failed: {e}")
+            scraped_data = []
         if scraped_data:
-            save_courses_to_json(scraped_data, json_path)
+            with profile_stage(profiler, "save"):
+                save_courses_to_json(scraped_data, json_path)
+                save_scrape_manifest(manifest, manifest_path)
+        else:
+            save_scrape_manifest({**manifest, "failed": True}, manifest_path)
+            if have_json:
+                print(f"Scrape returned no courses; keeping existing {json_path}.")
+                scraped_data = load_courses_from_json(json_path)
     else:
         scraped_data = load_courses_from_json(json_path)
 
+    if profiler:
+        profiler.extra["scraped"] = should_scrape
+
     # 2. Get Manual Data
     manual_data = load_manual_courses(manual_path)
 
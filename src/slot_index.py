@@ -0,0 +1,95 @@
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterable, List, Mapping, Set, Tuple
+
+from .conflict_matrix import ConflictMatrix
+from .models import Course
+from .occupancy import HALF_BITS, OccupancyMasks, half_bits
+
+# (day code, slot, "H1" | "H2")
+Cell = Tuple[int, int, str]
+
+EMPTY: FrozenSet[str] = frozenset()
+
+
+def halves_of(half: str) -> Tuple[str, ...]:
+    """The semester halves a course of this half meets in ("BOTH" -> H1 and H2)."""
+    bits = half_bits(half)
+    return tuple(h for h, bit in HALF_BITS.items() if bits & bit)
+
+
+class SlotIndex:
+    """
+    Read-only inverted index of the catalogue: (day, slot, half) -> ids of
+    the courses meeting then, plus each course's own cells, occupancy mask
+    and the dense ConflictMatrix for cohort queries. Built once when the
+    catalogue is loaded and shared by every session's Scheduler, so none of
+    them has to scan all_courses.
+    """
+
+    def __init__(self, courses: Iterable[Course]):
+        courses = list(courses)
+        cells: Dict[Cell, Set[str]] = {}
+        course_cells: Dict[str, FrozenSet[Cell]] = {}
+        for course in courses:
+            own = frozenset(
+                (sess.day, sess.slot, h)
+                for sess in course.sessions
+                for h in halves_of(course.half)
+            )
+            course_cells[course.id] = own
+            for cell in own:
+                cells.setdefault(cell, set()).add(course.id)
+
+        self._cells: Mapping[Cell, FrozenSet[str]] = MappingProxyType(
+            {cell: frozenset(ids) for cell, ids in cells.items()}
+        )
+        self._course_cells: Mapping[str, FrozenSet[Cell]] = MappingProxyType(
+            course_cells
+        )
+        self.masks: Mapping[str, int] = MappingProxyType(
+            OccupancyMasks(courses).masks
+        )
+        # course id -> the other courses sharing any of its cells
+        self._clashes: Mapping[str, FrozenSet[str]] = MappingProxyType(
+            {
+                cid: self.courses_meeting(own) - {cid}
+                for cid, own in course_cells.items()
+            }
+        )
+        self.matrix = ConflictMatrix(list(course_cells), self.masks)
+
+    def courses_at(self, day: int, slot: int, half: str) -> FrozenSet[str]:
+        """Courses meeting in one cell ("BOTH" asks for either half)."""
+        if half in HALF_BITS:
+            return self._cells.get((day, slot, half), EMPTY)
+        return self.courses_meeting((day, slot, h) for h in HALF_BITS)
+
+    def cells_of(self, course_id: str) -> FrozenSet[Cell]:
+        return self._course_cells.get(course_id, EMPTY)
+
+    def cells_of_all(self, course_ids: Iterable[str]) -> Set[Cell]:
+        cells: Set[Cell] = set()
+        for cid in course_ids:
+            cells |= self.cells_of(cid)
+        return cells
+
+    def courses_meeting(self, cells: Iterable[Cell]) -> FrozenSet[str]:
+        """Union of the index entries of several cells."""
+        found: Set[str] = set()
+        for cell in cells:
+            found |= self._cells.get(cell, EMPTY)
+        return frozenset(found)
+
+    def clashing_with(self, course_id: str) -> FrozenSet[str]:
+        return self._clashes.get(course_id, EMPTY)
+
+    def clashes(self, course_a: str, course_b: str) -> bool:
+        return bool(self.masks.get(course_a, 0) & self.masks.get(course_b, 0))
+
+    def blockers(self, course_id: str, selected: Iterable[str]) -> List[str]:
+        """The courses in `selected` that clash with `course_id`, sorted."""
+        mask = self.masks.get(course_id, 0)
+        return sorted(
+            cid for cid in selected
+            if cid != course_id and mask & self.masks.get(cid, 0)
+        )
@@ -0,0 +1,225 @@
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+# "Science II A" / "Science II B" -> sections of "Science II"
+SECTION_RE = re.compile(r"^(?P<base>.+) (?P<section>[A-Z])$")
+
+# Nodes between two looks at the clock
+CLOCK_EVERY = 256
+
+
+class Wish(NamedTuple):
+    """One wishlist entry: take exactly one of `alternatives` (or none, if optional)."""
+
+    key: str
+    alternatives: Tuple[str, ...]
+    masks: Tuple[int, ...]
+    required: bool
+
+
+class SolverResult(NamedTuple):
+    # Maximal conflict-free combinations, largest first (sorted course ids)
+    solutions: List[Tuple[str, ...]]
+    # False when the time budget ran out before the search finished
+    complete: bool
+    # Search nodes visited
+    explored: int
+    # Required wishes with no alternative that fits at all
+    impossible: List[str]
+
+
+def section_groups(course_ids: Iterable[str]) -> Dict[str, Tuple[str, ...]]:
+    """
+    Base name -> its sections, for ids that differ only in a trailing
+    section letter. A single "X I" is not a group, so Roman numerals are safe.
+    """
+    groups: Dict[str, List[str]] = {}
+    for cid in course_ids:
+        match = SECTION_RE.match(cid)
+        if match:
+            groups.setdefault(match.group("base"), []).append(cid)
+    return {base: tuple(sorted(ids)) for base, ids in groups.items() if len(ids) > 1}
+
+
+def build_wishes(
+    required: Iterable[str],
+    optional: Iterable[str],
+    masks: Mapping[str, int],
+    groups: Mapping[str, Tuple[str, ...]],
+) -> List[Wish]:
+    """
+    Turns course ids / section base names into Wishes. Naming any section
+    of a group (or the base name) wishes for the whole group; a course both
+    required and optional counts as required. Unknown names are dropped.
+    """
+    section_of = {cid: base for base, ids in groups.items() for cid in ids}
+    wishes: Dict[str, Wish] = {}
+    for is_required, names in ((True, required), (False, optional)):
+        for name in names:
+            key = section_of.get(name, name)
+            alternatives = groups.get(key, (key,) if key in masks else ())
+            if not alternatives or key in wishes:
+                continue
+            wishes[key] = Wish(
+                key,
+                alternatives,
+                tuple(masks[cid] for cid in alternatives),
+                is_required,
+            )
+    return list(wishes.values())
+
+
+def order_wishes(wishes: List[Wish], occupied: int) -> List[Wish]:
+    """Required first, then the most constrained (fewest fitting alternatives)."""
+    return sorted(
+        wishes,
+        key=lambda w: (
+            not w.required,
+            sum(1 for m in w.masks if not m & occupied),
+            w.key,
+        ),
+    )
+
+
+class _Search:
+    """Depth-first branch-and-bound over the ordered wishes."""
+
+    def __init__(self, wishes: Sequence[Wish], max_solutions: int, deadline: float):
+        self.wishes = wishes
+        self.max_solutions = max_solutions
+        self.deadline = deadline
+        self.solutions: Dict[Tuple[str, ...], int] = {}
+        self.explored = 0
+        self.timed_out = False
+
+    def _worst(self) -> int:
+        return min(self.solutions.values()) if self.solutions else -1
+
+    def _upper_bound(self, depth: int, used: int, picked: int) -> int:
+        """Picks so far plus every remaining wish that still has a fitting alternative."""
+        return picked + sum(
+            1 for w in self.wishes[depth:] if any(not m & used for m in w.masks)
+        )
+
+    def _record(self, chosen: List[str], used: int, skipped: List[Wish]):
+        # Maximal only: no skipped optional wish could still be added
+        if any(not m & used for w in skipped for m in w.masks):
+            return
+        solution = tuple(sorted(chosen))
+        if solution in self.solutions:
+            return
+        if len(self.solutions) >= self.max_solutions:
+            worst = self._worst()
+            if len(solution) <= worst:
+                return
+            drop = next(s for s, n in self.solutions.items() if n == worst)
+            del self.solutions[drop]
+        self.solutions[solution] = len(solution)
+
+    def run(self, depth: int, used: int, chosen: List[str], skipped: List[Wish]):
+        self.explored += 1
+        if self.explored % CLOCK_EVERY == 0 and time.monotonic() > self.deadline:
+            self.timed_out = True
+        if self.timed_out:
+            return
+
+        if depth == len(self.wishes):
+            self._record(chosen, used, skipped)
+            return
+
+        if len(self.solutions) >= self.max_solutions:
+            if self._upper_bound(depth, used, len(chosen)) <= self._worst():
+                return
+
+        wish = self.wishes[depth]
+        for cid, mask in zip(wish.alternatives, wish.masks):
+            if mask & used:
+                continue
+            chosen.append(cid)
+            self.run(depth + 1, used | mask, chosen, skipped)
+            chosen.pop()
+
+        if not wish.required:
+            skipped.append(wish)
+            self.run(depth + 1, used, chosen, skipped)
+            skipped.pop()
+
+
+def _solve_branch(
+    wishes: Sequence[Wish],
+    occupied: int,
+    first_choice: Optional[int],
+    seconds: float,
+    max_solutions: int,
+) -> Tuple[Dict[Tuple[str, ...], int], int, bool]:
+    """
+    Searches the subtree where the first wish takes alternative
+    `first_choice` (None = skipped). Runs in a worker process.
+    """
+    search = _Search(wishes, max_solutions, time.monotonic() + seconds)
+    first = wishes[0]
+    if first_choice is None:
+        search.run(1, occupied, [], [first])
+    else:
+        search.run(
+            1,
+            occupied | first.masks[first_choice],
+            [first.alternatives[first_choice]],
+            [],
+        )
+    return search.solutions, search.explored, not search.timed_out
+
+
+def solve(
+    wishes: List[Wish],
+    occupied: int = 0,
+    time_budget: float = 1.0,
+    max_solutions: int = 20,
+    workers: int = 1,
+) -> SolverResult:
+    """
+    Enumerates maximal conflict-free picks (one alternative per required
+    wish, at most one per optional wish) that also avoid `occupied`.
+    With workers > 1 the branches of the first wish are searched in a
+    process pool; each keeps its own top `max_solutions`.
+    """
+    impossible = [
+        w.key for w in wishes if w.required and all(m & occupied for m in w.masks)
+    ]
+    if impossible or not wishes:
+        return SolverResult([], True, 0, impossible)
+
+    wishes = order_wishes(wishes, occupied)
+    first = wishes[0]
+    branches: List[Optional[int]] = [
+        i for i, m in enumerate(first.masks) if not m & occupied
+    ]
+    if not first.required:
+        branches.append(None)
+
+    found: Dict[Tuple[str, ...], int] = {}
+    explored = 0
+    complete = True
+    args = [(wishes, occupied, b, time_budget, max_solutions) for b in branches]
+    if workers > 1 and len(branches) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(branches))) as pool:
+            outcomes = list(pool.map(_solve_branch, *zip(*args)))
+    else:
+        # One shared deadline when searching the branches one after another
+        deadline = time.monotonic() + time_budget
+        outcomes = []
+        for arg in args:
+            remaining = max(0.0, deadline - time.monotonic())
+            outcomes.append(_solve_branch(*arg[:3], remaining, max_solutions))
+
+    for solutions, nodes, finished in outcomes:
+        found.update(solutions)
+        explored += nodes
+        complete = complete and finished
+
+    # Leaves are checked against every skipped wish, so each recorded pick
+    # is maximal on its own; merging branches only needs the ranking.
+    ranked = sorted(found, key=lambda s: (-len(s), s))
+    return SolverResult(ranked[:max_solutions], complete, explored, [])
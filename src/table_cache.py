@@ -0,0 +1,94 @@
+import hashlib
+import json
+import os
+from typing import Any, Optional
+
+# Returned by PageTableCache.get when a page is not cached
+# (None is a valid extract_table() result).
+MISSING = object()
+
+
+class PageTableCache:
+    """
+    On-disk store of raw pdfplumber tables, one JSON file per page.
+    Pages are keyed by a hash of their content stream (plus the form
+    XObjects it draws), so a revised PDF only re-runs table detection on
+    the pages that actually changed. `version` names everything else the
+    tables depend on (e.g. the word-grid code and its columns), and prune()
+    keeps the directory to the most recently used `max_entries` pages.
+    """
+
+    # Pages kept on disk by default
+    MAX_ENTRIES = 2048
+
+    def __init__(
+        self, cache_dir: str, version: str = "", max_entries: int = MAX_ENTRIES
+    ):
+        self.cache_dir = cache_dir
+        self.version = version
+        self.max_entries = max_entries
+
+    def page_key(self, page, kind: str) -> str:
+        """Hash of a pdfplumber page's drawing instructions, the extraction kind and version."""
+        import pdfplumber
+        from pdfminer.pdftypes import resolve1
+
+        page_obj = page.page_obj
+        digest = hashlib.sha256()
+        digest.update(
+            f"{kind}|{self.version}|{pdfplumber.__version__}|{page_obj.mediabox}".encode()
+        )
+        for stream in page_obj.contents:
+            digest.update(resolve1(stream).get_data())
+
+        xobjects = resolve1((page_obj.resources or {}).get("XObject")) or {}
+        for name in sorted(xobjects):
+            xobject = resolve1(xobjects[name])
+            if hasattr(xobject, "get_data"):
+                digest.update(name.encode())
+                digest.update(xobject.get_data())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key: str) -> Any:
+        try:
+            with open(self._path(key), "r") as f:
+                tables = json.load(f)["tables"]
+            # A hit counts as a use for prune()
+            os.utime(self._path(key))
+            return tables
+        except Exception:
+            return MISSING
+
+    def put(self, key: str, tables: Optional[Any]):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write then rename, so parallel workers never see a partial file
+            tmp_path = f"{self._path(key)}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({"tables": tables}, f)
+            os.replace(tmp_path, self._path(key))
+        except Exception as e:
+            print(f"Error writing table cache: {e}")
+
+    def prune(self) -> int:
+        """Deletes the least recently used pages beyond max_entries; returns how many."""
+        try:
+            entries = [
+                e for e in os.scandir(self.cache_dir) if e.name.endswith(".json")
+            ]
+        except OSError:
+            return 0
+        if len(entries) <= self.max_entries:
+            return 0
+        entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+        removed = 0
+        for entry in entries[self.max_entries :]:
+            try:
+                os.remove(entry.path)
+                removed += 1
+            except OSError:
+                pass
+        return removed
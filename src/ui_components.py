@@ -1,17 +1,19 @@
 from nicegui import ui
 
+from .models import DAY_CODES
 from .utils import get_slot_time_str
 
 
 class TimetableGrid:
     def __init__(self):
-        self.cells = {}  # Map (Day, Slot) -> ui.element
+        self.cells = {}  # Map (Day code, Slot) -> ui.element
         self.header_cells = []  # Store header cells for theme updates
         self.day_cells = []  # Store day label cells for theme updates
         self.lunch_cell = None
         self.lunch_dividers = []
         self.grid_container = None
         self.dark_mode = False
+        self.free_cells = []  # (Day code, Slot, Half) cells the whole group has free
 
     def render(self):
         days = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat"]
@@ -62,7 +64,7 @@ class TimetableGrid:
                     with ui.column().classes(
                         "p-1 border min-h-[80px] text-xs relative group"
                     ) as cell:
-                        self.cells[(day, slot)] = cell
+                        self.cells[(DAY_CODES[day], slot)] = cell
 
                 divider = ui.element("div").classes("border")
                 self.lunch_dividers.append(divider)
@@ -71,7 +73,7 @@ class TimetableGrid:
                     with ui.column().classes(
                         "p-1 border min-h-[80px] text-xs relative group"
                     ) as cell:
-                        self.cells[(day, slot)] = cell
+                        self.cells[(DAY_CODES[day], slot)] = cell
 
     def set_theme(self, dark_mode):
         """Update grid colors based on theme"""
@@ -121,43 +123,67 @@ class TimetableGrid:
     def update(self, selected_courses):
         for cell in self.cells.values():
             cell.clear()
+            cell.classes(remove='opacity-60')
 
         for course in selected_courses:
-            day, slot = course["day"], course["slot"]
+            day, slot = course.day, course.slot
 
             if (day, slot) in self.cells:
                 with self.cells[(day, slot)]:
                     if self.dark_mode:
                         color = (
                             "bg-blue-700 text-blue-100"
-                            if course["half"] == "BOTH"
+                            if course.half == "BOTH"
                             else (
                                 "bg-green-700 text-green-100"
-                                if course["half"] == "H1"
+                                if course.half == "H1"
                                 else "bg-purple-700 text-purple-100"
                             )
                         )
                     else:
                         color = (
                             "bg-blue-100 text-blue-900"
-                            if course["half"] == "BOTH"
+                            if course.half == "BOTH"
                             else (
                                 "bg-green-100 text-green-900"
-                                if course["half"] == "H1"
+                                if course.half == "H1"
                                 else "bg-purple-100 text-purple-900"
                             )
                         )
 
                     with ui.card().classes(f"w-full p-1 {color} shadow-sm mb-1"):
-                        ui.label(course["name"]).classes(
+                        ui.label(course.name).classes(
                             "font-medium leading-tight")
-                        classroom = course.get("classroom", "TBD")
+                        classroom = course.classroom
                         if classroom and classroom != "TBD":
                             ui.label(classroom).classes(
                                 "text-[10px] font-semibold text-gray-700 dark:text-gray-300"
                             )
-                        if course["half"] != "BOTH":
+                        if course.half != "BOTH":
                             half_text_color = "text-gray-300" if self.dark_mode else "text-gray-600"
-                            ui.label(course["half"]).classes(
+                            ui.label(course.half).classes(
                                 f"text-[10px] {half_text_color}"
                             )
+
+    def preview(self, sessions):
+        """Draw a candidate timetable (e.g. a ranked solver result) faded, without selecting it"""
+        self.update(sessions)
+        for cell in self.cells.values():
+            cell.classes('opacity-60')
+
+    def set_overlay(self, free_cells):
+        """Outline the cells everyone in the group has free (solid: both halves, thin: one half)"""
+        self.free_cells = list(free_cells)
+        halves = {}
+        for day, slot, half in self.free_cells:
+            halves.setdefault((day, slot), set()).add(half)
+
+        for key, cell in self.cells.items():
+            cell.classes(remove='ring-2 ring-1 ring-inset ring-green-400 ring-green-300')
+            cell.props(remove='title')
+            free = halves.get(key, set())
+            if len(free) == 2:
+                cell.classes('ring-2 ring-inset ring-green-400')
+            elif free:
+                cell.classes('ring-1 ring-inset ring-green-300')
+                cell.props(f'title="Everyone free in {next(iter(free))}"')
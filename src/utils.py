@@ -1,4 +1,8 @@
-from datetime import date, time
+import hashlib
+import json
+import os
+from datetime import date, time, timedelta
+from typing import Dict, FrozenSet, Iterator, List, NamedTuple, Optional, Tuple
 
 # --- Time Slots ---
 # Maps Slot Index (1-6) to (Start Time, End Time)
@@ -23,46 +27,152 @@ def get_slot_time_str(slot_idx: int) -> str:
 
 DAYS_MAP = {0: "Mon", 1: "Tue", 2: "Wed", 3: "Thu", 4: "Fri", 5: "Sat", 6: "Sun"}
 
-# --- Semester Dates (Spring 2026) ---
-SEM_START = date(2026, 1, 2)
-SEM_END = date(2026, 4, 25)
+# --- Academic Calendar ---
+# Semester rules live in calendar.json (several semesters side by side) and
+# are compiled once into a dense per-day table.
+CALENDAR_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "calendar.json"
+)
+
+_DAY_CODES = {name: code for code, name in DAYS_MAP.items()}
+
+
+def _parse_date(value: str) -> date:
+    return date.fromisoformat(value)
+
+
+class CalendarDay(NamedTuple):
+    date: date
+    weekday: Optional[int]  # DAYS_MAP code whose timetable runs; None = no classes
+    half: str  # "H1", "H2" or "NONE"
+    cancelled: FrozenSet[int]  # slots not held
+    remaps: Tuple[Tuple[int, int, int], ...]  # (source day, source slot, slot held in)
+    blackout: bool
+    holiday: bool
+
+
+class AcademicCalendar:
+    """
+    One semester of calendar.json compiled into a list with an entry per
+    date, so "which timetable runs today, in which half, minus which
+    slots" is a single index instead of scanning every rule.
+    """
+
+    def __init__(self, data: Dict):
+        self.name: str = data["name"]
+        self.start = _parse_date(data["start"])
+        self.end = _parse_date(data["end"])
+        self.halves: Dict[str, Tuple[date, date]] = {
+            half: (_parse_date(a), _parse_date(b))
+            for half, (a, b) in data["halves"].items()
+        }
+        self.holidays: FrozenSet[date] = frozenset(
+            _parse_date(d) for d in data.get("holidays", [])
+        )
+        self.blackouts: List[Tuple[date, date]] = [
+            (_parse_date(a), _parse_date(b)) for a, b in data.get("blackouts", [])
+        ]
+        weekly_off = {_DAY_CODES[d] for d in data.get("weekly_off", [])}
+        follows = {
+            _parse_date(d): _DAY_CODES[day]
+            for d, day in data.get("follows", {}).items()
+        }
+        cancelled = {
+            _parse_date(d): frozenset(slots)
+            for d, slots in data.get("cancelled_slots", {}).items()
+        }
+        remaps = {
+            _parse_date(d): tuple(
+                (_DAY_CODES[r["day"]], r["slot"], r["to"]) for r in rules
+            )
+            for d, rules in data.get("remaps", {}).items()
+        }
+        # Changes whenever the semester's rules do (for export caches)
+        self.version = hashlib.sha1(
+            json.dumps(data, sort_keys=True).encode()
+        ).hexdigest()[:12]
+
+        # The table spans every date any rule mentions
+        self.first = min([self.start, *self.holidays, *(a for a, _ in self.blackouts)])
+        self.last = max([self.end, *self.holidays, *(b for _, b in self.blackouts)])
+
+        blackout_days = set()
+        for a, b in self.blackouts:
+            blackout_days.update(a + timedelta(days=i) for i in range((b - a).days + 1))
+
+        self._days: List[CalendarDay] = []
+        for i in range((self.last - self.first).days + 1):
+            d = self.first + timedelta(days=i)
+            off = (
+                d in blackout_days
+                or d in self.holidays
+                or d.weekday() in weekly_off
+                or not self.start <= d <= self.end
+            )
+            self._days.append(
+                CalendarDay(
+                    d,
+                    None if off else follows.get(d, d.weekday()),
+                    self._half_of(d),
+                    cancelled.get(d, frozenset()),
+                    remaps.get(d, ()),
+                    d in blackout_days,
+                    d in self.holidays,
+                )
+            )
+
+    def _half_of(self, d: date) -> str:
+        for half, (a, b) in self.halves.items():
+            if a <= d <= b:
+                return half
+        return "NONE"
+
+    def day(self, d: date) -> CalendarDay:
+        if self.first <= d <= self.last:
+            return self._days[(d - self.first).days]
+        return CalendarDay(d, None, self._half_of(d), frozenset(), (), False, False)
+
+    def teaching_days(self) -> Iterator[CalendarDay]:
+        """The days classes are held, in date order."""
+        return (day for day in self._days if day.weekday is not None)
+
+    def is_blackout(self, d: date) -> bool:
+        return self.day(d).blackout
+
+    def semester_half(self, d: date) -> str:
+        return self.day(d).half
+
+
+def load_calendars(
+    path: str = CALENDAR_PATH,
+) -> Tuple[Dict[str, AcademicCalendar], str]:
+    """All semesters in the calendar file, and the name of the default one."""
+    with open(path, "r") as f:
+        data = json.load(f)
+    calendars = {sem["name"]: AcademicCalendar(sem) for sem in data["semesters"]}
+    return calendars, data.get("default", next(iter(calendars)))
+
+
+CALENDARS, DEFAULT_SEMESTER = load_calendars()
+CALENDAR = CALENDARS[DEFAULT_SEMESTER]
+
+# --- Semester Dates (from the default semester) ---
+SEM_START = CALENDAR.start
+SEM_END = CALENDAR.end
 
 # Half Semester Ranges
-H1_START = date(2026, 1, 2)
-H1_END = date(2026, 2, 25)
-H2_START = date(2026, 3, 3)
-H2_END = date(2026, 4, 25)
+H1_START, H1_END = CALENDAR.halves["H1"]
+H2_START, H2_END = CALENDAR.halves["H2"]
 
 # --- Exceptions ---
-HOLIDAYS = {
-    date(2026, 1, 13),
-    date(2026, 1, 14),
-    date(2026, 1, 26),
-    date(2026, 3, 14),
-    date(2026, 3, 19),
-    date(2026, 3, 21),
-    date(2026, 4, 3),
-}
-
-BLACKOUT_RANGES = [
-    (date(2026, 2, 13), date(2026, 2, 15)),  # Feb Blackout
-    (date(2026, 2, 26), date(2026, 3, 2)),  # Mid-sems
-    (date(2026, 3, 14), date(2026, 3, 15)),  # March Blackout
-    (date(2026, 4, 26), date(2026, 12, 31)),  # Post Sem
-]
+HOLIDAYS = CALENDAR.holidays
+BLACKOUT_RANGES = CALENDAR.blackouts
 
 
 def is_blackout(d: date) -> bool:
-    for start, end in BLACKOUT_RANGES:
-        if start <= d <= end:
-            return True
-    return False
+    return CALENDAR.is_blackout(d)
 
 
 def get_semester_half(d: date) -> str:
-    """Returns 'H1', 'H2', or 'BOTH' depending on the date."""
-    if H1_START <= d <= H1_END:
-        return "H1"
-    elif H2_START <= d <= H2_END:
-        return "H2"
-    return "NONE"
+    """Returns 'H1', 'H2', or 'NONE' depending on the date."""
+    return CALENDAR.semester_half(d)
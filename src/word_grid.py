@@ -0,0 +1,186 @@
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .utils import TIME_SLOTS
+
+DAY_NAMES = {"Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"}
+TIME_RE = re.compile(r"(\d{1,2})[:.](\d{2})")
+
+# Bump whenever a change here alters extract_word_grid's output, so pages
+# cached by an older version are extracted again
+WORD_GRID_VERSION = 1
+
+# Slot start "H:MM" (24h and 12h forms) -> slot index
+SLOT_STARTS: Dict[Tuple[int, int], int] = {
+    key: slot
+    for slot, (start, _) in TIME_SLOTS.items()
+    for key in ((start.hour, start.minute), (start.hour % 12 or 12, start.minute))
+}
+
+
+def _split_point(lo: float, hi: float, spans: Sequence[Tuple[float, float]]) -> float:
+    """
+    Picks a cut between lo and hi that crosses as little text as possible:
+    the middle of the widest stretch of [lo, hi] not covered by any span.
+    """
+    if hi <= lo:
+        return (lo + hi) / 2
+
+    covered = sorted((max(a, lo), min(b, hi)) for a, b in spans if b > lo and a < hi)
+    best_gap, best_mid = -1.0, (lo + hi) / 2
+    cursor = lo
+    for a, b in covered + [(hi, hi)]:
+        if a - cursor > best_gap:
+            best_gap, best_mid = a - cursor, (cursor + a) / 2
+        cursor = max(cursor, b)
+    return best_mid
+
+
+def _edge_between(
+    positions: Sequence[float], lo: float, hi: float, target: float
+) -> Optional[float]:
+    """The ruling line strictly between lo and hi closest to `target`, if any."""
+    inside = [p for p in positions if lo < p < hi]
+    if not inside:
+        return None
+    return min(inside, key=lambda p: abs(p - target))
+
+
+def _group_lines(words: List[Dict], tolerance: float = 3) -> str:
+    """Joins words in reading order, one output line per text line."""
+    lines: List[List[Dict]] = []
+    for word in sorted(words, key=lambda w: (w["top"], w["x0"])):
+        if lines and abs(word["top"] - lines[-1][0]["top"]) <= tolerance:
+            lines[-1].append(word)
+        else:
+            lines.append([word])
+    return "\n".join(
+        " ".join(w["text"] for w in sorted(line, key=lambda w: w["x0"]))
+        for line in lines
+    )
+
+
+def _header_labels(words: List[Dict], anchor: Dict) -> Dict[int, Tuple[float, float]]:
+    """Slot index -> (x0, x1) of its time label in the header row holding `anchor`."""
+    line_h = anchor["bottom"] - anchor["top"]
+    band = sorted(
+        (w for w in words if abs(w["top"] - anchor["top"]) <= line_h / 2),
+        key=lambda w: w["x0"],
+    )
+
+    # Words closer than a line height apart belong to the same label
+    labels: List[List[Dict]] = []
+    for word in band:
+        if labels and word["x0"] - labels[-1][-1]["x1"] <= line_h:
+            labels[-1].append(word)
+        else:
+            labels.append([word])
+
+    slots = {}
+    for label in labels:
+        found = TIME_RE.search(" ".join(w["text"] for w in label))
+        if not found:
+            continue
+        slot = SLOT_STARTS.get((int(found.group(1)), int(found.group(2))))
+        if slot is not None and slot not in slots:
+            slots[slot] = (label[0]["x0"], label[-1]["x1"])
+    return slots
+
+
+def extract_word_grid(page, slot_columns: Dict[int, int]) -> Optional[List[List[str]]]:
+    """
+    Rebuilds the timetable grid of a page from word coordinates instead of
+    table detection. Columns are calibrated from the header row holding
+    "8:30" and rows from the day labels below it. Returns one row per day in
+    the same layout as extract_table() (slot N in column slot_columns[N]),
+    or None when the page does not look like a timetable.
+    """
+    words = page.extract_words()
+    anchor = next((w for w in words if "8:30" in w["text"]), None)
+    if anchor is None:
+        return None
+
+    labels = _header_labels(words, anchor)
+    if len(labels) != len(TIME_SLOTS):
+        return None
+    slots = sorted(labels)
+
+    day_words = sorted(
+        (
+            w
+            for w in words
+            if w["top"] > anchor["bottom"]
+            and w["x1"] <= labels[slots[0]][0]
+            and w["text"][:3].title() in DAY_NAMES
+        ),
+        key=lambda w: w["top"],
+    )
+    if not day_words:
+        return None
+
+    body = [w for w in words if w["top"] > anchor["bottom"]]
+    x_spans = [(w["x0"], w["x1"]) for w in body]
+    y_spans = [(w["top"], w["bottom"]) for w in body]
+
+    # Cell borders come from the page's ruling lines where there are any,
+    # otherwise from the widest whitespace gap between the labels.
+    v_lines = sorted(
+        {e["x0"] for e in page.vertical_edges if e["bottom"] > anchor["top"]}
+    )
+    h_lines = sorted(
+        {e["top"] for e in page.horizontal_edges if e["top"] > anchor["top"]}
+    )
+
+    def center(w: Dict, axis: str) -> float:
+        return (w["x0"] + w["x1"]) / 2 if axis == "x" else (w["top"] + w["bottom"]) / 2
+
+    def cut(lines, spans, lo, hi, target=None):
+        line = _edge_between(lines, lo, hi, (lo + hi) / 2 if target is None else target)
+        return line if line is not None else _split_point(lo, hi, spans)
+
+    # Column bounds per slot: [left, right) between the neighbouring labels
+    left_edge = max(w["x1"] for w in day_words)
+    columns = []
+    for idx, slot in enumerate(slots):
+        x0, x1 = labels[slot]
+        prev_x1 = labels[slots[idx - 1]][1] if idx else left_edge
+        next_x0 = (
+            labels[slots[idx + 1]][0] if idx + 1 < len(slots) else float(page.width)
+        )
+        left = cut(v_lines, x_spans, prev_x1, x0 + 1, target=x0)
+        if idx + 1 < len(slots):
+            right = cut(v_lines, x_spans, x1 - 1, next_x0, target=x1)
+        else:
+            right = _edge_between(v_lines, x1 - 1, next_x0, x1) or float(page.width)
+        columns.append((slot, left, right))
+
+    # Row cuts: below the header, between consecutive day labels, below the last
+    y_cuts = [
+        cut(
+            h_lines,
+            y_spans,
+            center(anchor, "y"),
+            center(day_words[0], "y"),
+            target=day_words[0]["top"],
+        )
+    ]
+    for prev, nxt in zip(day_words, day_words[1:]):
+        y_cuts.append(cut(h_lines, y_spans, center(prev, "y"), center(nxt, "y")))
+    last = center(day_words[-1], "y")
+    y_cuts.append(
+        _edge_between(h_lines, last, float(page.height), last) or float(page.height)
+    )
+
+    width = max(slot_columns.values()) + 1
+    grid = []
+    for row_idx, day_word in enumerate(day_words):
+        top, bottom = y_cuts[row_idx], y_cuts[row_idx + 1]
+        row_words = [w for w in body if top <= center(w, "y") < bottom]
+
+        row = [""] * width
+        row[0] = day_word["text"]
+        for slot, left, right in columns:
+            cell_words = [w for w in row_words if left <= center(w, "x") < right]
+            row[slot_columns[slot]] = _group_lines(cell_words)
+        grid.append(row)
+    return grid
@@ -0,0 +1,96 @@
+import re
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+
+from src.generators import generate_ics_string
+from src.ics_writer import iter_ics
+from src.models import FlatSession
+
+IST = timedelta(hours=5, minutes=30)
+
+
+def sample_selection():
+    """Every day and slot, in every half, plus names that need escaping."""
+    selection = []
+    for day in range(6):
+        for slot in range(1, 7):
+            half = ("H1", "H2", "BOTH")[(day + slot) % 3]
+            name = f"Course {day}-{slot}"
+            selection.append(FlatSession(name, half, day, slot, name, f"Room {slot}"))
+    selection.append(FlatSession("Lab; A, B (Alice/Bob)", "BOTH", 0, 3, "Lab", ""))
+    return selection
+
+
+def parse_time(value):
+    """A DTSTART/EXDATE/... value as a naive local (IST) datetime."""
+    if value.endswith("Z"):
+        return datetime.strptime(value, "%Y%m%dT%H%M%SZ") + IST
+    return datetime.strptime(value, "%Y%m%dT%H%M%S")
+
+
+def expand(ics):
+    """
+    Every occurrence in the calendar as (start, end, summary, location),
+    with FREQ=WEEKLY;UNTIL RRULEs, EXDATEs and RDATEs expanded by hand.
+    """
+    ics = re.sub(r"\r?\n[ \t]", "", ics)  # unfold
+    occurrences = Counter()
+    for block in re.findall(r"BEGIN:VEVENT\r?\n(.*?)END:VEVENT", ics, re.S):
+        props = {}
+        for line in block.splitlines():
+            name, value = line.split(":", 1)
+            props[name.split(";")[0]] = value
+
+        start = parse_time(props["DTSTART"])
+        length = parse_time(props["DTEND"]) - start
+        starts = [start]
+        if "RRULE" in props:
+            rule = dict(part.split("=") for part in props["RRULE"].split(";"))
+            assert set(rule) == {"FREQ", "UNTIL"} and rule["FREQ"] == "WEEKLY"
+            until = parse_time(rule["UNTIL"])
+            while starts[-1] + timedelta(weeks=1) <= until:
+                starts.append(starts[-1] + timedelta(weeks=1))
+        for value in props.get("EXDATE", "").split(","):
+            if value:
+                starts.remove(parse_time(value))
+        for value in props.get("RDATE", "").split(","):
+            if value:
+                starts.append(parse_time(value))
+
+        for s in starts:
+            occurrences[
+                (s, s + length, props["SUMMARY"], props.get("LOCATION", ""))
+            ] += 1
+    return occurrences
+
+
+def test_rrule_expands_to_the_expanded_events():
+    selection = sample_selection()
+    expanded = generate_ics_string(selection)
+    recurring = generate_ics_string(selection, recurring=True)
+
+    assert recurring.count("BEGIN:VEVENT") < expanded.count("BEGIN:VEVENT")
+    assert "RRULE:" in recurring and "RRULE:" not in expanded
+    assert expand(recurring) == expand(expanded)
+
+
+@pytest.mark.parametrize("recurring", [False, True])
+def test_streaming_writer_matches_ics_library(recurring):
+    selection = sample_selection()
+    streamed = "".join(iter_ics(selection, recurring=recurring))
+    assert expand(streamed) == expand(generate_ics_string(selection, recurring))
+
+
+def test_calendar_exceptions_are_applied():
+    occurrences = expand(generate_ics_string(sample_selection(), recurring=True))
+    starts = {(start, summary) for start, _, summary, _ in occurrences}
+    # Holiday (Republic Day, a Monday) and the mid-semester break
+    assert not any(s.date() == datetime(2026, 1, 26).date() for s, _ in starts)
+    assert not any(s.date() == datetime(2026, 2, 27).date() for s, _ in starts)
+    # 2026-02-21 (Sat) runs Monday's slots 1-3 in slots 4-6
+    assert (datetime(2026, 2, 21, 15, 35), "Course 0-2") in starts
+    assert (datetime(2026, 2, 21, 17, 10), "Lab\\; A\\, B (Alice/Bob)") in starts
+    # ... but not Course 0-1: it is an H2 course, and H2 starts in March
+    assert not any(n == "Course 0-1" and s.month == 2 for s, n in starts)
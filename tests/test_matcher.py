@@ -0,0 +1,95 @@
+import random
+
+from src.matcher import TermMatcher
+from src.scraper import CourseScraper
+
+ALIAS_MAP = CourseScraper.ALIAS_MAP
+TWO_SLOT_COURSES = CourseScraper.TWO_SLOT_COURSES
+
+# Overlapping names on purpose: prefixes, suffixes and terms inside terms
+TERMS = sorted(
+    {
+        "Thinking and Knowing in the Human Sciences I",
+        "Introduction to Human Sciences",
+        "Human Sciences",
+        "Science Lab II",
+        "Science II",
+        "Science",
+        "Value Education II",
+        "Value Education",
+        "Business Finance",
+        "Finance",
+        "Electronics Workshop",
+        "Data Structures and Algorithms",
+        "Algorithms",
+        "Lab",
+        "AI",
+    },
+    key=len,
+    reverse=True,
+)
+
+
+def naive_match(cell_upper):
+    """The scraper's original per-cell loop over every term."""
+    matches = []
+    remaining = cell_upper
+    for term in TERMS:
+        term_upper = term.upper()
+        aliases = ALIAS_MAP.get(term_upper, [])
+        pattern = next(
+            (p for p in (term_upper, *aliases) if p in remaining),
+            None,
+        )
+        if pattern is None:
+            continue
+        is_two_slot = any(ts in term_upper for ts in TWO_SLOT_COURSES) or any(
+            ts in alias for alias in aliases for ts in TWO_SLOT_COURSES
+        )
+        matches.append((term, pattern, is_two_slot))
+        remaining = remaining.replace(pattern, " " * len(pattern))
+    return matches
+
+
+def random_cells(count, seed=0):
+    pool = [t.upper() for t in TERMS]
+    pool += [alias for aliases in ALIAS_MAP.values() for alias in aliases]
+    pool += ["(H1)", "H2", "ROOM 101", "-", " ", "\n"]
+    rng = random.Random(seed)
+    cells = []
+    for _ in range(count):
+        cell = " ".join(rng.sample(pool, rng.randint(1, 4)))
+        if rng.random() < 0.3:
+            # Splice a term into the middle of another one
+            at = rng.randint(0, len(cell))
+            cell = cell[:at] + rng.choice(pool) + cell[at:]
+        cells.append(cell)
+    return cells
+
+
+def test_match_agrees_with_naive_loop():
+    matcher = TermMatcher(TERMS, ALIAS_MAP, TWO_SLOT_COURSES)
+    for cell in random_cells(5000):
+        assert matcher.match(cell) == naive_match(cell), cell
+
+
+def test_alias_and_two_slot():
+    matcher = TermMatcher(TERMS, ALIAS_MAP, TWO_SLOT_COURSES)
+    assert matcher.match("SCIENCE LAB 2 (H1)") == [
+        ("Science Lab II", "SCIENCE LAB 2", True)
+    ]
+    assert matcher.match("TKHS - I") == [
+        ("Thinking and Knowing in the Human Sciences I", "TKHS - I", False)
+    ]
+
+
+def test_blanked_match_is_not_matched_again():
+    matcher = TermMatcher(TERMS, ALIAS_MAP, TWO_SLOT_COURSES)
+    # "SCIENCE" and "LAB" inside "SCIENCE LAB II" are claimed by the longer term
+    assert [m[0] for m in matcher.match("SCIENCE LAB II")] == ["Science Lab II"]
+    # ... but a separate occurrence still matches
+    assert [m[0] for m in matcher.match("SCIENCE LAB II / SCIENCE")] == [
+        "Science Lab II",
+        "Science",
+    ]
+    assert matcher.match("NOTHING HERE") == []
@@ -0,0 +1,108 @@
+import random
+
+from src.scheduler import Scheduler
+
+DAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat"]
+PEOPLE = ["Alice", "Bob", "Cy"]
+
+
+def random_catalogue(count=40, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"Course {i}",
+            "name": f"Course {i}",
+            "half": rng.choice(["H1", "H2", "BOTH"]),
+            "classroom": "TBD",
+            "sessions": [
+                {"day": rng.choice(DAYS), "slot": rng.randint(1, 6)}
+                for _ in range(rng.randint(1, 3))
+            ],
+        }
+        for i in range(count)
+    ]
+
+
+def clash(a, b):
+    """Straight from the JSON: a shared (day, slot) in an overlapping half."""
+    halves_overlap = "BOTH" in (a["half"], b["half"]) or a["half"] == b["half"]
+    cells_a = {(s["day"], s["slot"]) for s in a["sessions"]}
+    cells_b = {(s["day"], s["slot"]) for s in b["sessions"]}
+    return a["id"] != b["id"] and halves_overlap and bool(cells_a & cells_b)
+
+
+def conflicting(courses, selected):
+    """Unselected courses clashing with any of `selected`, rescanned from scratch."""
+    return {
+        c["id"]
+        for c in courses
+        if c["id"] not in selected
+        and any(clash(c, other) for other in selected.values())
+    }
+
+
+def test_index_clashes_match_pairwise_scan():
+    courses = random_catalogue()
+    index = Scheduler(courses).index
+    for a in courses:
+        expected = {b["id"] for b in courses if clash(a, b)}
+        assert index.clashing_with(a["id"]) == expected
+        for b in courses:
+            if b is not a:
+                assert index.clashes(a["id"], b["id"]) == clash(a, b)
+
+
+def test_incremental_conflicts_match_full_rescan():
+    courses = random_catalogue()
+    by_id = {c["id"]: c for c in courses}
+    scheduler = Scheduler(courses)
+    selected = {person: {} for person in PEOPLE}
+    rng = random.Random(1)
+
+    for _ in range(500):
+        person = rng.choice(PEOPLE)
+        cid = rng.choice(courses)["id"]
+        before = conflicting(courses, selected[person])
+
+        delta = scheduler.toggle_course(cid, person)
+        if cid in selected[person]:
+            del selected[person][cid]
+        else:
+            selected[person][cid] = by_id[cid]
+        after = conflicting(courses, selected[person])
+
+        assert delta.course_id == cid and delta.person_name == person
+        assert delta.selected == (cid in selected[person])
+        assert delta.now_conflicting == after - before
+        assert delta.now_available == before - after
+        for name in PEOPLE:
+            assert scheduler.get_conflicting_ids(name) == conflicting(
+                courses, selected[name]
+            )
+            assert {c for c in by_id if scheduler.is_selected(c, name)} == set(
+                selected[name]
+            )
+
+
+def test_blocking_ids_are_the_clashing_selections():
+    courses = random_catalogue()
+    by_id = {c["id"]: c for c in courses}
+    scheduler = Scheduler(courses)
+    rng = random.Random(2)
+    picked = rng.sample(sorted(by_id), 8)
+    for cid in picked:
+        scheduler.toggle_course(cid, "Alice")
+
+    for cid, course in by_id.items():
+        expected = sorted(p for p in picked if clash(course, by_id[p]))
+        assert scheduler.get_blocking_ids(cid, "Alice") == expected
+
+
+def test_out_of_grid_sessions_are_skipped():
+    courses = random_catalogue(count=4)
+    courses[0]["sessions"].append({"day": "Mon", "slot": 7})
+    scheduler = Scheduler(courses)
+    for course in courses:
+        scheduler.toggle_course(course["id"], "Alice")
+
+    assert all(s.slot != 7 for s in scheduler.get_selected_courses_flat())
@@ -0,0 +1,101 @@
+import itertools
+import random
+
+from src.solver import build_wishes, section_groups, solve
+
+
+def random_problem(rng):
+    """Course masks over a 16-cell grid, some ids being sections of one course."""
+    ids = [f"Course {i}" for i in range(rng.randint(3, 8))]
+    ids += [f"Lab {s}" for s in "ABC"[: rng.randint(0, 3)]]
+    masks = {cid: rng.getrandbits(16) & rng.getrandbits(16) or 1 for cid in ids}
+    picked = rng.sample(ids, rng.randint(1, len(ids)))
+    split = rng.randint(0, min(2, len(picked)))
+    return masks, picked[:split], picked[split:], rng.getrandbits(16) & 0x0F0F
+
+
+def brute_force(wishes, occupied):
+    """Every maximal conflict-free pick, by trying all combinations."""
+    choices = [w.alternatives + (() if w.required else (None,)) for w in wishes]
+    masks = {cid: m for w in wishes for cid, m in zip(w.alternatives, w.masks)}
+    found = set()
+    for combo in itertools.product(*choices):
+        used = occupied
+        for cid in combo:
+            if cid is not None:
+                if masks[cid] & used:
+                    break
+                used |= masks[cid]
+        else:
+            # Maximal: no skipped optional wish still fits
+            if any(
+                cid is None and any(not m & used for m in w.masks)
+                for cid, w in zip(combo, wishes)
+            ):
+                continue
+            found.add(tuple(sorted(cid for cid in combo if cid)))
+    return found
+
+
+def test_solutions_match_brute_force():
+    rng = random.Random(0)
+    for _ in range(300):
+        masks, required, optional, occupied = random_problem(rng)
+        wishes = build_wishes(required, optional, masks, section_groups(masks))
+        result = solve(wishes, occupied, time_budget=10, max_solutions=10**6)
+        expected = brute_force(wishes, occupied)
+
+        assert result.complete
+        if result.impossible:
+            assert not expected
+            continue
+        assert set(result.solutions) == expected
+        assert len(result.solutions) == len(expected)
+        assert [len(s) for s in result.solutions] == sorted(
+            (len(s) for s in expected), reverse=True
+        )
+
+
+def test_top_solutions_are_the_largest():
+    rng = random.Random(1)
+    for _ in range(100):
+        masks, required, optional, occupied = random_problem(rng)
+        wishes = build_wishes(required, optional, masks, section_groups(masks))
+        expected = brute_force(wishes, occupied)
+        result = solve(wishes, occupied, max_solutions=3)
+
+        assert set(result.solutions) <= expected
+        assert [len(s) for s in result.solutions] == sorted(
+            (len(s) for s in expected), reverse=True
+        )[:3]
+
+
+def test_sections_are_alternatives_of_one_wish():
+    masks = {"Lab A": 0b001, "Lab B": 0b010, "Maths": 0b001}
+    groups = section_groups(masks)
+    assert groups == {"Lab": ("Lab A", "Lab B")}
+
+    wishes = build_wishes(["Lab A", "Maths"], [], masks, groups)
+    assert [w.alternatives for w in wishes] == [("Lab A", "Lab B"), ("Maths",)]
+    # Lab A clashes with Maths, so only section B fits
+    assert solve(wishes).solutions == [("Lab B", "Maths")]
+
+
+def test_impossible_required_wish():
+    wishes = build_wishes(["Maths"], ["Art"], {"Maths": 0b01, "Art": 0b10}, {})
+    result = solve(wishes, occupied=0b01)
+    assert result.impossible == ["Maths"]
+    assert result.solutions == []
+
+
+def test_parallel_matches_serial():
+    rng = random.Random(2)
+    masks = {
+        f"Course {i}": rng.getrandbits(24) & rng.getrandbits(24) for i in range(12)
+    }
+    masks.update({"Lab A": 0b1, "Lab B": 0b10, "Lab C": 0b100})
+    wishes = build_wishes(["Lab"], list(masks), masks, section_groups(masks))
+    serial = solve(wishes, time_budget=10, max_solutions=50)
+    parallel = solve(wishes, time_budget=10, max_solutions=50, workers=2)
+    assert serial.complete and parallel.complete
+    assert parallel.solutions == serial.solutions